@@ -5,12 +5,13 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
-from result_loader import create_summary_dataframe, load_summary_jsons
+from result_loader import create_summary_dataframe, load_results_store, load_summary_jsons
 
 
 EVAL_DIR = Path(__file__).resolve().parent
 ROOT = EVAL_DIR.parents[1]
 BASE_PATH = EVAL_DIR.parent / "output"
+RESULTS_DB = BASE_PATH / "results.sqlite"
 RESULTS_PATH = EVAL_DIR / "df_results.parquet"
 
 SETS_TO_LOAD = [
@@ -117,8 +118,16 @@ def build_strategy(row: pd.Series) -> str:
 
 
 def load_results(base_path: Path, sets_to_load: list[str]) -> pd.DataFrame:
-    summary_data = load_summary_jsons(str(base_path), sets_to_load)
-    print(f"Loaded {len(summary_data)} summary files")
+    # Sets run with --results-store are read from the store, all others from
+    # their summary files.
+    summary_data = []
+    if RESULTS_DB.exists():
+        summary_data = load_results_store(str(RESULTS_DB), sets_to_load)
+    store_sets = {summary.get("instance_set") for summary in summary_data}
+    json_sets = [name for name in sets_to_load if name not in store_sets]
+    if json_sets:
+        summary_data += load_summary_jsons(str(base_path), json_sets)
+    print(f"Loaded {len(summary_data)} summaries")
 
     if not summary_data:
         raise RuntimeError(f"No summary files found below {base_path}")
@@ -17,7 +17,24 @@ def _find_summary_files(base_path: str, instance_sets: list[str]) -> dict[str, l
         directory = base / instance_set
         if not directory.is_dir():
             continue
-        paths = sorted(directory.glob("*/*summary.json"))
+        paths = []
+        for instance_dir in sorted(path for path in directory.iterdir() if path.is_dir()):
+            # Sharded output layouts list their summaries in a manifest.
+            manifest = instance_dir / "manifest.jsonl"
+            if manifest.exists():
+                with open(manifest, "rb") as f:
+                    entries = [orjson.loads(line) for line in f if line.strip()]
+                summaries = {}
+                for entry in entries:
+                    if entry["kind"] != "summary":
+                        continue
+                    if entry.get("removed"):
+                        summaries.pop(entry["path"], None)
+                    else:
+                        summaries[entry["path"]] = instance_dir / entry["path"]
+                paths.extend(summaries.values())
+            else:
+                paths.extend(sorted(instance_dir.glob("*summary.json")))
         if paths:
             files[instance_set] = paths
     return files
@@ -57,6 +74,17 @@ def load_summary_jsons(base_path: str, instance_sets: list[str]) -> list[dict]:
     return summaries
 
 
+def load_results_store(db_path: str, instance_sets: list[str]) -> list[dict]:
+    """Load the summaries of finished pipelines from a SQLite results store."""
+    from ware_ops_pipes.pipelines.results_store import ResultsStore
+
+    df = ResultsStore(db_path).frame(instance_sets, with_summary=True)
+    df = df[df["status"] == "ok"]
+    for instance_set, n_rows in df["instance_set"].value_counts().items():
+        print(f"{instance_set}: {n_rows} results loaded")
+    return list(df["summary"])
+
+
 def create_summary_dataframe(summaries: list[dict]) -> pd.DataFrame:
     rows = []
 
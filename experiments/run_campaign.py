@@ -0,0 +1,28 @@
+import argparse
+from pathlib import Path
+
+from ware_ops_pipes.synthesis.campaign import Campaign
+
+
+def main():
+    print("Importing template and subproblems...")
+
+    # Configuration
+    parser = argparse.ArgumentParser()
+    parser.add_argument("spec", type=Path,
+                        help="Campaign spec (.toml or .yaml), see experiments/campaign.toml.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Override the global number of instance workers of the spec.")
+    args = parser.parse_args()
+
+    PROJECT_ROOT = Path(__file__).parent.parent
+
+    campaign = Campaign.from_file(args.spec, PROJECT_ROOT, workers=args.workers)
+    report = campaign.run()
+    for set_name, summary in report["sets"].items():
+        print(f"{set_name}: {summary['n_instances']} instances in {summary['total_time']:.1f}s")
+    print(f"Campaign wall time: {report['wall_time']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
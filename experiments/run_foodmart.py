@@ -5,6 +5,7 @@ import argparse
 from ware_ops_pipes.data_loaders import FoodmartLoader
 from ware_ops_algos.domain_models import load_and_flatten_data_card
 
+from ware_ops_pipes.synthesis.cli import add_runner_arguments, runner_kwargs
 from ware_ops_pipes.synthesis.runner import PipelineRunner
 
 
@@ -27,8 +28,7 @@ def main():
 
     # Configuration
     parser = argparse.ArgumentParser()
-    parser.add_argument("--workers", type=int, default=1,
-                        help="Number of Luigi workers (parallel pipelines).")
+    add_runner_arguments(parser)
     args = parser.parse_args()
 
     PROJECT_ROOT = Path(__file__).parent.parent
@@ -41,7 +41,7 @@ def main():
                             excluded=["ExactSolving"],
                             verbose=True,
                             time_limit_sec=240, loader_cls=FoodmartLoader,
-                            workers=args.workers)
+                            **runner_kwargs(args, PROJECT_ROOT))
     runner.run_all()
     print(runner.pipeline_runtimes)
 
@@ -5,6 +5,7 @@ from typing import Tuple
 from ware_ops_algos.domain_models import load_and_flatten_data_card
 
 from ware_ops_pipes.data_loaders import HesslerIrnichLoader
+from ware_ops_pipes.synthesis.cli import add_runner_arguments, runner_kwargs
 from ware_ops_pipes.synthesis.runner import PipelineRunner
 
 instance_data_card_mapping = {
@@ -41,8 +42,7 @@ def main():
                                  "HennWaescherClassBased"],
                         nargs="?",
                         default="BahceciOencan")
-    parser.add_argument("--workers", type=int, default=1,
-                        help="Number of Luigi workers (parallel pipelines).")
+    add_runner_arguments(parser)
     args = parser.parse_args()
     instance_set = args.instance_set
     excluded = ["ExactSolving"]
@@ -60,7 +60,7 @@ def main():
                                  data_card=dc, excluded=excluded, verbose=True,
                                  time_limit_sec=240, loader_cls=HesslerIrnichLoader, loader_kwargs={
                                     "mirror_top_depot": True,
-                                }, workers=args.workers)
+                                }, **runner_kwargs(args, PROJECT_ROOT))
 
     runner.run_all()
 
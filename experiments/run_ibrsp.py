@@ -4,6 +4,7 @@ from typing import Tuple
 
 from ware_ops_pipes.data_loaders import IBRSPLoader
 from ware_ops_algos.domain_models import load_and_flatten_data_card
+from ware_ops_pipes.synthesis.cli import add_runner_arguments, runner_kwargs
 from ware_ops_pipes.synthesis.runner import PipelineRunner
 
 
@@ -27,8 +28,7 @@ def main():
                         choices=["KrisSmallDataCorrected", "KrisLargeData"],
                         nargs="?",
                         default="KrisSmallDataCorrected")
-    parser.add_argument("--workers", type=int, default=1,
-                        help="Number of Luigi workers (parallel pipelines).")
+    add_runner_arguments(parser)
     args = parser.parse_args()
     instance_set = args.instance_set
 
@@ -43,7 +43,7 @@ def main():
                          loader_cls=IBRSPLoader,
                          verbose=True,
                          time_limit_sec=240,
-                         workers=args.workers)
+                         **runner_kwargs(args, PROJECT_ROOT))
     runner.run_all()
     print(runner.pipeline_runtimes)
 
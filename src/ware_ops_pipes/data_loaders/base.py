@@ -1,6 +1,30 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import zipfile
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+import numpy as np
+
+# Per-process LRU caches of parsed instances, layout signatures and content
+# keys, keyed by loader, loader kwargs, path, size and mtime of the instance
+# file. Parsing is memoized for the few instances a process works on at a
+# time only; the small signatures and keys for more, but still bounded, as
+# warm workers live through whole campaigns.
+_PARSED: OrderedDict[tuple, Any] = OrderedDict()
+_MAX_PARSED = 2
+_SIGNATURES: OrderedDict[tuple, dict] = OrderedDict()
+_CONTENT_KEYS: OrderedDict[tuple, str] = OrderedDict()
+_MAX_KEYS = 256
+
+# Bumped whenever the arrays returned by tokenize_instance change, which
+# invalidates the persisted parse cache.
+_TOKENS_FORMAT = 2
 
 
 class DataLoader(ABC):
@@ -11,9 +35,261 @@ class DataLoader(ABC):
     def load(self, *args, **kwargs) -> Any:
         pass
 
+    def pipeline_loader_kwargs(self) -> dict:
+        return {}
+
+    def tokenize_instance(self, filepath: str | Path) -> dict[str, np.ndarray]:
+        """The sections of an instance file as NumPy arrays.
+
+        Only needed for the persistent parse cache; loaders without it
+        cannot be parsed with a ``cache_dir``.
+        """
+        raise NotImplementedError
+
+    def assemble_instance(self, tokens: dict[str, np.ndarray]) -> Any:
+        """The parsed instance built from ``tokenize_instance`` output."""
+        raise NotImplementedError
+
+    def parse_instance_cached(
+            self,
+            filepath: str | Path,
+            cache_dir: str | Path | None = None,
+    ) -> Any:
+        """``parse_instance`` memoized within the process.
+
+        With ``cache_dir`` the tokenized instance is also persisted there as
+        ``parsed__<key>.npz``, keyed by the file content and the loader
+        kwargs, so other processes, runs and instance sets referencing the
+        same file skip tokenizing the text.
+
+        The returned structure is shared by all callers and must not be
+        modified.
+        """
+        key = self._file_key(filepath)
+        parsed = _lru_get(_PARSED, key)
+        if parsed is None:
+            if cache_dir is None:
+                parsed = self.parse_instance(filepath)
+            elif not self._tokenizes():
+                raise NotImplementedError(
+                    f"{type(self).__name__} does not implement tokenize_instance "
+                    "and assemble_instance, which the parse cache requires"
+                )
+            else:
+                parsed = self.assemble_instance(self._cached_tokens(filepath, cache_dir))
+            _lru_put(_PARSED, key, parsed, _MAX_PARSED)
+        return parsed
+
+    def instance_layout_signature(self, filepath: str | Path) -> dict:
+        """Layout signature of an instance file, memoized within the process.
+
+        Loaders override ``_scan_layout_signature`` to read only the header
+        or the layout sections, so computing a layout key never parses the
+        orders.
+        """
+        key = self._file_key(filepath)
+        signature = _lru_get(_SIGNATURES, key)
+        if signature is None:
+            signature = self._scan_layout_signature(filepath)
+            _lru_put(_SIGNATURES, key, signature, _MAX_KEYS)
+        return signature
+
+    def _scan_layout_signature(self, filepath: str | Path) -> dict:
+        return self.layout_signature(self.parse_instance_cached(filepath))
+
+    def _cached_tokens(self, filepath: str | Path, cache_dir: str | Path) -> dict[str, np.ndarray]:
+        path = os.path.join(cache_dir, f"parsed__{self._content_key(filepath)}.npz")
+
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                tokens = {name: npz[name] for name in npz.files}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, zipfile.BadZipFile) as exc:
+            print(f"Ignoring unreadable parse cache entry {path}: {exc}")
+        else:
+            try:
+                # Usage time for the LRU eviction of the data cache.
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            return tokens
+
+        tokens = self.tokenize_instance(filepath)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "wb") as file:
+            np.savez(file, **tokens)
+        os.replace(tmp, path)
+
+        return tokens
+
+    def _tokenizes(self) -> bool:
+        cls = type(self)
+        return (
+            cls.tokenize_instance is not DataLoader.tokenize_instance
+            and cls.assemble_instance is not DataLoader.assemble_instance
+        )
+
+    def _content_key(self, filepath: str | Path) -> str:
+        key = self._file_key(filepath)
+        content_key = _lru_get(_CONTENT_KEYS, key)
+        if content_key is None:
+            with open(self._resolve_path(filepath), "rb") as file:
+                digest = hashlib.file_digest(file, "sha256").hexdigest()
+            payload = {
+                "loader": type(self).__qualname__,
+                "loader_kwargs": self.pipeline_loader_kwargs(),
+                "content": digest,
+                "format": _TOKENS_FORMAT,
+            }
+            content_key = hashlib.sha256(
+                json.dumps(payload, sort_keys=True).encode("utf-8")
+            ).hexdigest()[:16]
+            _lru_put(_CONTENT_KEYS, key, content_key, _MAX_KEYS)
+        return content_key
+
+    def _file_key(self, filepath: str | Path) -> tuple:
+        path = self._resolve_path(filepath)
+        stat = os.stat(path)
+        return (
+            type(self).__qualname__,
+            json.dumps(self.pipeline_loader_kwargs(), sort_keys=True),
+            str(path),
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+
+    def _resolve_path(self, filepath: str | Path) -> Path:
+        filepath = Path(filepath)
+        if not filepath.is_absolute():
+            filepath = self.data_dir / filepath
+        return filepath
+
+    @staticmethod
+    def _section_digest(path: str | Path, prefix: str) -> str:
+        """SHA-256 of the lines from the first one starting with ``prefix``.
+
+        Lines are stripped and blank lines dropped, as by ``InstanceReader``,
+        so the digest does not depend on whitespace.
+        """
+        with InstanceReader(path) as reader:
+            data = reader.data
+            match = _line_prefix_pattern([prefix]).search(data)
+            if match is None:
+                raise ValueError(f"{path} has no {prefix!r} section")
+
+            h = hashlib.sha256()
+            for line in data[match.start():].splitlines():
+                line = line.strip()
+                if line:
+                    h.update(line)
+                    h.update(b"\n")
+            return h.hexdigest()
+
     def _load_text(self, filename: str | Path, encoding: str = "utf-8") -> list[str]:
-        path = Path(filename)
-        if not path.is_absolute():
-            path = self.data_dir / path
-        with path.open("r", encoding=encoding) as file:
+        with self._resolve_path(filename).open("r", encoding=encoding) as file:
             return [line.strip() for line in file if line.strip()]
+
+    def _open_text(self, filename: str | Path, encoding: str = "utf-8") -> "InstanceReader":
+        return InstanceReader(self._resolve_path(filename), encoding=encoding)
+
+
+class InstanceReader:
+    """Lazy line reader over a memory-mapped instance file.
+
+    Lines are returned stripped and blank lines are skipped. Sections are
+    found by searching the mapping for a line prefix, and whole sections
+    can be taken as one block of text for bulk parsing, so the file is
+    never held as a list of lines::
+
+        with loader._open_text(path) as reader:
+            reader.seek_prefix("//Arcs")
+            block = reader.read_until("//LocStart")
+    """
+
+    def __init__(self, path: str | Path, encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+        self._file = self.path.open("rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:  # empty files cannot be mapped
+            self.data = b""
+        self._pos = 0
+
+    def __enter__(self) -> "InstanceReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __iter__(self) -> Iterator[str]:
+        while (line := self.next_line()) is not None:
+            yield line
+
+    def next_line(self) -> str | None:
+        data = self.data
+        while self._pos < len(data):
+            end = data.find(b"\n", self._pos)
+            if end < 0:
+                end = len(data)
+            line = data[self._pos:end].decode(self.encoding).strip()
+            self._pos = end + 1
+            if line:
+                return line
+        return None
+
+    def peek_line(self) -> str | None:
+        pos = self._pos
+        line = self.next_line()
+        self._pos = pos
+        return line
+
+    def seek_prefix(self, prefix: str) -> str | None:
+        """Move past the next line starting with ``prefix`` and return it."""
+        return self.seek_any_prefix([prefix])
+
+    def seek_any_prefix(self, prefixes: list[str]) -> str | None:
+        self._pos = self._find(prefixes)
+        return self.next_line()
+
+    def read_until(self, prefix: str | None = None) -> str:
+        """Text up to the next line starting with ``prefix``, or to the end.
+
+        The reader stops in front of that line.
+        """
+        end = len(self.data) if prefix is None else self._find([prefix])
+        block = self.data[self._pos:end].decode(self.encoding)
+        self._pos = end
+        return block
+
+    def _find(self, prefixes: list[str]) -> int:
+        pattern = _line_prefix_pattern(prefixes, self.encoding)
+        match = pattern.search(self.data, self._pos)
+        return len(self.data) if match is None else match.start()
+
+
+def _lru_get(cache: OrderedDict, key: tuple) -> Any:
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: OrderedDict, key: tuple, value: Any, max_size: int) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
+
+def _line_prefix_pattern(prefixes: list[str], encoding: str = "utf-8") -> re.Pattern:
+    alternatives = b"|".join(re.escape(prefix.encode(encoding)) for prefix in prefixes)
+    return re.compile(rb"^[ \t]*(?:" + alternatives + rb")", re.MULTILINE)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from typing import Any, Dict
 
-import networkx as nx
-from scipy.sparse.csgraph import floyd_warshall
+import numpy as np
 
 from ware_ops_algos.domain_models.layout.graph_generators import (
     ExplicitGraphGenerator,
@@ -33,7 +33,17 @@ from ware_ops_algos.domain_models import (
     WarehouseInfoType,
 )
 from ware_ops_algos.domain_models.base_domain import BaseWarehouseDomain
-from ware_ops_pipes.data_loaders.base import DataLoader
+from ware_ops_pipes.data_loaders.base import DataLoader, InstanceReader
+from ware_ops_pipes.data_loaders.sections import (
+    edge_table,
+    edges_as_arcs,
+    edges_as_paths,
+    iter_positions,
+    position_table,
+    vertex_table,
+    vertices_as_coords,
+)
+from ware_ops_pipes.data_loaders.shortest_paths import predecessor_matrix
 
 
 class FoodmartLoader(DataLoader):
@@ -62,8 +72,7 @@ class FoodmartLoader(DataLoader):
         return self.build_domain_with_layout(parsed, layout)
 
     def parse_instance(self, filepath: str | Path) -> Dict[str, Any]:
-        filepath = self._resolve_path(filepath)
-        return self._parse(str(filepath))
+        return self.assemble_instance(self.tokenize_instance(filepath))
 
     def layout_signature(self, parsed: Dict[str, Any]) -> dict:
         header = parsed["header"]
@@ -86,7 +95,19 @@ class FoodmartLoader(DataLoader):
             ),
         }
 
-    def build_layout(self, parsed: Dict[str, Any]) -> LayoutData:
+    def _scan_layout_signature(self, filepath: str | Path) -> dict:
+        # The layout is fully described by the //Graph section and the ones
+        # following it (arcs, shortest paths and vertices), so the products and orders
+        # before it are not even split into lines.
+        return {
+            "graph_section": self._section_digest(self._resolve_path(filepath), "//Graph"),
+        }
+
+    def build_layout(
+        self,
+        parsed: Dict[str, Any],
+        with_predecessors: bool = True,
+    ) -> LayoutData:
         header = parsed["header"]
         arcs = parsed["arcs"]
         shortest_paths = parsed["shortest_paths"]
@@ -117,18 +138,10 @@ class FoodmartLoader(DataLoader):
         )
 
         nodes = list(graph.nodes())
-        adjacency = nx.to_scipy_sparse_array(
-            graph,
-            nodelist=nodes,
-            weight="weight",
-            dtype=float,
-        )
 
-        _, predecessors = floyd_warshall(
-            adjacency,
-            directed=False,
-            return_predecessors=True,
-        )
+        # The instance ships the distances; predecessors are only needed to
+        # expand tours.
+        predecessors = predecessor_matrix(graph, nodes) if with_predecessors else None
 
         intersection_nodes = [
             (x, y)
@@ -246,77 +259,24 @@ class FoodmartLoader(DataLoader):
         layout = self.build_layout(parsed)
         return self.build_domain_with_layout(parsed, layout)
 
-    def _resolve_path(self, filepath: str | Path) -> Path:
-        filepath = Path(filepath)
-
-        if not filepath.is_absolute():
-            filepath = self.data_dir / filepath
-
-        return filepath
+    def tokenize_instance(self, filepath: str | Path) -> Dict[str, np.ndarray]:
+        with self._open_text(filepath, encoding="utf-8") as reader:
+            return self._read_sections(reader)
 
-    def _parse(self, filepath: str) -> Dict[str, Any]:
-        lines = self._load_text(filepath, encoding="utf-8")
-
-        line_idx = 0
+    def _read_sections(self, reader: InstanceReader) -> Dict[str, np.ndarray]:
         header = {}
-        articles = []
-        sku_entries = []
-        order_entries = []
-        arcs = []
-        locations = []
-        shortest_paths = {}
-        vertices_coords = {}
-
-        departing_depot = None
-        arrival_depot = None
-
-        def next_line():
-            nonlocal line_idx
-
-            if line_idx < len(lines):
-                line = lines[line_idx]
-                line_idx += 1
-                return line
-
-            return None
-
-        def peek_line():
-            return lines[line_idx] if line_idx < len(lines) else None
-
-        def skip_to_prefix(prefix: str):
-            nonlocal line_idx
-
-            while line_idx < len(lines) and not lines[line_idx].startswith(prefix):
-                line_idx += 1
-
-            if line_idx < len(lines):
-                return next_line()
-
-            return None
-
-        def skip_to_any_prefix(prefixes: list[str]):
-            nonlocal line_idx
-
-            while line_idx < len(lines) and not any(
-                lines[line_idx].startswith(prefix)
-                for prefix in prefixes
-            ):
-                line_idx += 1
-
-            if line_idx < len(lines):
-                return next_line()
-
-            return None
+        products = []
+        orders = []
 
         def next_data_line():
-            line = next_line()
+            line = reader.next_line()
 
             while line is not None and line.startswith("//"):
-                line = next_line()
+                line = reader.next_line()
 
             return line
 
-        skip_to_prefix("//NbLocations")
+        reader.seek_prefix("//NbLocations")
         header["NbLocations"] = int(next_data_line())
         header["NbProducts"] = int(next_data_line())
         header["K_NbBoxesTrolley"] = int(next_data_line().split()[0])
@@ -324,139 +284,108 @@ class FoodmartLoader(DataLoader):
         header["B_CapaBox"] = int(next_data_line().split()[0])
         header["BoxCanMixOrders"] = int(next_data_line().split()[0])
 
-        skip_to_prefix("//Products")
+        reader.seek_prefix("//Products")
 
         for _ in range(header["NbProducts"]):
             parts = next_data_line().split()
 
-            article_id = int(parts[0])
-            location = int(parts[1])
-            volume = float(parts[2])
-
-            articles.append(
-                Article(
-                    article_id=article_id,
-                    volume=volume,
-                )
-            )
-            sku_entries.append((article_id, location))
+            # article id, location id, volume
+            products.append((int(parts[0]), int(parts[1]), float(parts[2])))
 
-        skip_to_prefix("//Orders")
-        skip_to_any_prefix(["//Nb Orders", "//NbOrders"])
+        reader.seek_prefix("//Orders")
+        reader.seek_any_prefix(["//Nb Orders", "//NbOrders"])
 
         header["NbOrders"] = int(next_data_line())
 
+        order_numbers = []
+
         for _ in range(header["NbOrders"]):
             parts = next_data_line().split()
 
-            order_number = int(parts[0])
+            order_numbers.append(int(parts[0]))
             nb_products_in_order = int(parts[2])
 
-            idx = 3
-            positions = []
-
-            for _ in range(nb_products_in_order):
-                article_id = int(parts[idx])
-                amount = int(parts[idx + 1])
-
-                positions.append(
-                    {
-                        "article_id": article_id,
-                        "amount": amount,
-                    }
-                )
-                idx += 2
-
-            order_entries.append(
-                Order.from_dict(
-                    order_number,
-                    {
-                        "order_positions": positions,
-                    },
-                )
-            )
+            orders.append([
+                (int(parts[idx]), int(parts[idx + 1]))
+                for idx in range(3, 3 + 2 * nb_products_in_order, 2)
+            ])
 
-        skip_to_prefix("//Graph")
+        reader.seek_prefix("//Graph")
 
         header["NbVerticesIntersections"] = int(next_data_line())
         header["DepartingDepot"] = int(next_data_line())
         header["ArrivalDepot"] = int(next_data_line())
 
-        departing_depot = header["DepartingDepot"]
-        arrival_depot = header["ArrivalDepot"]
-
-        skip_to_prefix("//Arcs")
-        next_line()
-
-        while True:
-            line = peek_line()
-
-            if line is None or line.startswith("//LocStart"):
-                break
-
-            parts = next_line().split()
-
-            if len(parts) >= 3:
-                arcs.append(
-                    (
-                        int(parts[0]),
-                        int(parts[1]),
-                        float(parts[2]),
-                    )
-                )
-
-        skip_to_prefix("//LocStart")
+        reader.seek_prefix("//Arcs")
+        reader.next_line()
+        arc_nodes, arc_lengths = edge_table(reader.read_until("//LocStart"))
 
-        while True:
-            line = peek_line()
+        reader.seek_prefix("//LocStart")
+        path_nodes, path_lengths = edge_table(reader.read_until("//Vertices"))
 
-            if line is None or line.startswith("//Vertices"):
-                break
-
-            parts = next_line().split()
-
-            if len(parts) >= 3:
-                shortest_paths[(int(parts[0]), int(parts[1]))] = float(parts[2])
-
-        skip_to_prefix("//Vertices")
-
-        while (line := next_line()) is not None:
-            if line.startswith("//"):
-                continue
+        reader.seek_prefix("//Vertices")
+        vertex_ids, vertex_xy, vertex_types = vertex_table(
+            reader.read_until(), header["DepartingDepot"], header["ArrivalDepot"]
+        )
 
-            parts = line.split()
+        offsets, position_articles, position_amounts = position_table(orders)
+        products = np.array(products, dtype=float).reshape(-1, 3)
 
-            try:
-                idx = int(parts[0])
-                x = float(parts[1])
-                y = float(parts[2])
-                label = parts[3].strip('"')
+        return {
+            "header": np.array(json.dumps(header)),
+            "product_ids": products[:, 0].astype(np.int64),
+            "product_locations": products[:, 1].astype(np.int64),
+            "product_volumes": np.ascontiguousarray(products[:, 2]),
+            "order_numbers": np.array(order_numbers, dtype=np.int64),
+            "order_offsets": offsets,
+            "position_articles": position_articles,
+            "position_amounts": position_amounts,
+            "arc_nodes": arc_nodes,
+            "arc_lengths": arc_lengths,
+            "path_nodes": path_nodes,
+            "path_lengths": path_lengths,
+            "vertex_ids": vertex_ids,
+            "vertex_xy": vertex_xy,
+            "vertex_types": vertex_types,
+        }
 
-                match label:
-                    case "depot":
-                        if idx == departing_depot:
-                            node_type = "start_node"
-                        elif idx == arrival_depot:
-                            node_type = "end_node"
-                            x += 1
-                        else:
-                            node_type = "depot_node"
+    def assemble_instance(self, tokens: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        header = json.loads(str(tokens["header"]))
 
-                    case "product":
-                        node_type = "pick_node"
+        product_ids = tokens["product_ids"].tolist()
 
-                    case "intersection":
-                        node_type = "intersection"
+        articles = [
+            Article(
+                article_id=article_id,
+                volume=volume,
+            )
+            for article_id, volume in zip(product_ids, tokens["product_volumes"].tolist())
+        ]
 
-                    case _:
-                        raise ValueError(f"Unknown node type: {label}")
+        order_entries = [
+            Order.from_dict(
+                order_number,
+                {
+                    "order_positions": positions,
+                },
+            )
+            for order_number, positions in zip(
+                tokens["order_numbers"].tolist(),
+                iter_positions(
+                    tokens["order_offsets"],
+                    tokens["position_articles"],
+                    tokens["position_amounts"],
+                ),
+            )
+        ]
 
-                vertices_coords[idx] = (x, y, node_type)
+        vertices_coords = vertices_as_coords(
+            tokens["vertex_ids"], tokens["vertex_xy"], tokens["vertex_types"]
+        )
 
-            except (ValueError, IndexError) as exc:
-                print(f"Warning: Error parsing vertex line: {line} — {exc}")
+        locations = []
 
-        for article_id, location_id in sku_entries:
+        for article_id, location_id in zip(product_ids, tokens["product_locations"].tolist()):
             x, y, _ = vertices_coords.get(location_id, (0, 0, ""))
 
             locations.append(
@@ -473,7 +402,7 @@ class FoodmartLoader(DataLoader):
             "articles": articles,
             "locations": locations,
             "orders": order_entries,
-            "arcs": arcs,
-            "shortest_paths": shortest_paths,
+            "arcs": edges_as_arcs(tokens["arc_nodes"], tokens["arc_lengths"]),
+            "shortest_paths": edges_as_paths(tokens["path_nodes"], tokens["path_lengths"]),
             "vertices_coords": vertices_coords,
         }
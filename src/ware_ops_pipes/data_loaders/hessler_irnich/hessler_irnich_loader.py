@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from typing import Any, Dict, List
 
-import networkx as nx
+import numpy as np
 import pandas as pd
-from scipy.sparse.csgraph import floyd_warshall
 
 from ware_ops_algos.domain_models import (
     Article,
@@ -32,7 +32,9 @@ from ware_ops_algos.domain_models import (
 )
 from ware_ops_algos.domain_models.base_domain import BaseWarehouseDomain
 from ware_ops_algos.domain_models.layout.graph_generators import ShelfStorageGraphGenerator
-from ware_ops_pipes.data_loaders.base import DataLoader
+from ware_ops_pipes.data_loaders.base import DataLoader, InstanceReader
+from ware_ops_pipes.data_loaders.sections import iter_positions, position_table
+from ware_ops_pipes.data_loaders.shortest_paths import shortest_path_matrices
 
 
 class HesslerIrnichLoader(DataLoader):
@@ -64,8 +66,7 @@ class HesslerIrnichLoader(DataLoader):
         return self.build_domain_with_layout(parsed, layout)
 
     def parse_instance(self, filepath: str | Path) -> Dict[str, Any]:
-        filepath = self._resolve_path(filepath)
-        return self._parse(str(filepath))
+        return self.assemble_instance(self.tokenize_instance(filepath))
 
     def layout_signature(self, parsed: Dict[str, Any]) -> dict:
         ctx = self._layout_context(parsed)
@@ -88,7 +89,32 @@ class HesslerIrnichLoader(DataLoader):
             "end_connection_point": ctx["end_connection_point"],
         }
 
-    def build_layout(self, parsed: Dict[str, Any]) -> LayoutData:
+    def _scan_layout_signature(self, filepath: str | Path) -> dict:
+        # The layout depends on the header only, which ends at the article
+        # section.
+        with self._open_text(filepath, encoding="windows-1252") as reader:
+            header = self._read_header(reader)
+
+        return self.layout_signature({"header": header})
+
+    @staticmethod
+    def _read_header(reader: InstanceReader) -> Dict[str, str]:
+        header: Dict[str, str] = {}
+
+        for line in reader:
+            if line.startswith("ARTICLE_SECTION"):
+                break
+            if ":" in line:
+                key, value = line.split(":", 1)
+                header[key.strip().upper()] = value.strip()
+
+        return header
+
+    def build_layout(
+        self,
+        parsed: Dict[str, Any],
+        with_predecessors: bool = True,
+    ) -> LayoutData:
         ctx = self._layout_context(parsed)
 
         layout_parameters = LayoutParameters(
@@ -128,17 +154,10 @@ class HesslerIrnichLoader(DataLoader):
         graph = graph_generator.G
 
         nodes = list(graph.nodes())
-        adjacency = nx.to_scipy_sparse_array(
+        distance_matrix_raw, predecessors = shortest_path_matrices(
             graph,
-            nodelist=nodes,
-            weight="weight",
-            dtype=float,
-        )
-
-        distance_matrix_raw, predecessors = floyd_warshall(
-            adjacency,
-            directed=False,
-            return_predecessors=True,
+            nodes,
+            with_predecessors=with_predecessors,
         )
 
         distance_matrix = pd.DataFrame(
@@ -282,14 +301,6 @@ class HesslerIrnichLoader(DataLoader):
         layout = self.build_layout(parsed)
         return self.build_domain_with_layout(parsed, layout)
 
-    def _resolve_path(self, filepath: str | Path) -> Path:
-        filepath = Path(filepath)
-
-        if not filepath.is_absolute():
-            filepath = self.data_dir / filepath
-
-        return filepath
-
     def _layout_context(self, parsed: Dict[str, Any]) -> dict:
         header = parsed["header"]
 
@@ -365,21 +376,24 @@ class HesslerIrnichLoader(DataLoader):
 
         return "OBRP"
 
-    def _parse(self, filepath: str) -> Dict[str, Any]:
-        lines = self._load_text(filepath, encoding="windows-1252")
+    def tokenize_instance(self, filepath: str | Path) -> Dict[str, np.ndarray]:
+        """The sections of an instance file as NumPy arrays.
 
-        header: Dict[str, str] = {}
-        articles: List[Dict[str, int]] = []
-        sku_entries: List[Dict[str, Any]] = []
-        order_entries: List[List[Dict[str, int]]] = []
+        ``articles`` holds the article ids and weights; the weight column is
+        only meaningful where ``article_has_weight`` is set, articles without
+        a ``W`` field have a weight of 0 there.
+        """
+        with self._open_text(filepath, encoding="windows-1252") as reader:
+            return self._read_sections(reader)
 
-        idx = 0
+    def _read_sections(self, reader: InstanceReader) -> Dict[str, np.ndarray]:
+        articles: List[tuple[int, int]] = []
+        has_weight: List[bool] = []
+        skus: List[tuple[int, int, int, int]] = []
+        sides: List[str] = []
+        orders: List[List[tuple[int, int]]] = []
 
-        while idx < len(lines) and not lines[idx].startswith("ARTICLE_SECTION"):
-            if ":" in lines[idx]:
-                key, value = lines[idx].split(":", 1)
-                header[key.strip().upper()] = value.strip()
-            idx += 1
+        header = self._read_header(reader)
 
         required = [
             "NUM_AISLES",
@@ -398,77 +412,101 @@ class HesslerIrnichLoader(DataLoader):
         if missing:
             raise ValueError(f"Missing required header keys: {missing}")
 
-        idx += 1
+        for line in reader:
+            if line.startswith("SKU_SECTION"):
+                break
 
-        while idx < len(lines) and not lines[idx].startswith("SKU_SECTION"):
-            if lines[idx].startswith("ID"):
-                parts = lines[idx].split()
+            if line.startswith("ID"):
+                parts = line.split()
 
                 if len(parts) == 2:
-                    articles.append(
-                        {
-                            "article_id": int(parts[1]),
-                        }
-                    )
+                    articles.append((int(parts[1]), 0))
+                    has_weight.append(False)
                 else:
-                    articles.append(
-                        {
-                            "article_id": int(parts[1]),
-                            "weight": int(parts[3]),
-                        }
-                    )
-
-            idx += 1
-
-        idx += 1
+                    articles.append((int(parts[1]), int(parts[3])))
+                    has_weight.append(True)
 
         n_cells = int(header["NUM_CELLS"])
 
-        while idx < len(lines) and not lines[idx].startswith("ORDER_SECTION"):
-            if lines[idx].startswith("ID"):
-                parts = lines[idx].split()
-
-                sku_entries.append(
-                    {
-                        "article_id": int(parts[1]),
-                        "aisle": int(parts[3]),
-                        "cell": n_cells - int(parts[5]),
-                        "quantity": int(parts[7]),
-                        "side": parts[-1],
-                    }
-                )
-
-            idx += 1
+        for line in reader:
+            if line.startswith("ORDER_SECTION"):
+                break
 
-        idx += 1
+            if line.startswith("ID"):
+                parts = line.split()
 
-        current_order: List[Dict[str, int]] = []
+                skus.append(
+                    (
+                        int(parts[1]),
+                        int(parts[3]),
+                        n_cells - int(parts[5]),
+                        int(parts[7]),
+                    )
+                )
+                sides.append(parts[-1])
 
-        while idx < len(lines):
-            line = lines[idx]
+        current_order: List[tuple[int, int]] = []
 
+        for line in reader:
             if line.startswith("NUM_ARTICLES_IN_ORDER"):
                 if current_order:
-                    order_entries.append(current_order)
+                    orders.append(current_order)
                     current_order = []
 
             elif line.startswith("ID"):
                 parts = line.split()
 
-                current_order.append(
-                    {
-                        "article_id": int(parts[1]),
-                        "amount": int(parts[3]),
-                    }
-                )
-
-            idx += 1
+                current_order.append((int(parts[1]), int(parts[3])))
 
         if current_order:
-            order_entries.append(current_order)
+            orders.append(current_order)
+
+        offsets, position_articles, position_amounts = position_table(orders)
+
+        return {
+            "header": np.array(json.dumps(header)),
+            "articles": np.array(articles, dtype=np.int64).reshape(-1, 2),
+            "article_has_weight": np.array(has_weight, dtype=bool),
+            "skus": np.array(skus, dtype=np.int64).reshape(-1, 4),
+            "sku_sides": np.array(sides, dtype=str),
+            "order_offsets": offsets,
+            "position_articles": position_articles,
+            "position_amounts": position_amounts,
+        }
+
+    def assemble_instance(self, tokens: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        articles: List[Dict[str, int]] = [
+            {"article_id": article_id, "weight": weight}
+            if has_weight
+            else {"article_id": article_id}
+            for (article_id, weight), has_weight in zip(
+                tokens["articles"].tolist(), tokens["article_has_weight"].tolist()
+            )
+        ]
+
+        sku_entries: List[Dict[str, Any]] = [
+            {
+                "article_id": article_id,
+                "aisle": aisle,
+                "cell": cell,
+                "quantity": quantity,
+                "side": side,
+            }
+            for (article_id, aisle, cell, quantity), side in zip(
+                tokens["skus"].tolist(), tokens["sku_sides"].tolist()
+            )
+        ]
+
+        order_entries: List[List[Dict[str, int]]] = list(
+            iter_positions(
+                tokens["order_offsets"],
+                tokens["position_articles"],
+                tokens["position_amounts"],
+            )
+        )
 
         return {
-            "header": header,
+            "header": json.loads(str(tokens["header"])),
             "articles": articles,
             "skus": sku_entries,
             "orders": order_entries,
@@ -0,0 +1,182 @@
+"""Bulk parsers for the numeric sections of instance files.
+
+The arcs, shortest path (``//LocStart``) and vertex sections of Foodmart and
+IBRSP instances are dense tables with tens of thousands of rows on large
+instances. Each section is passed as one block of text, as returned by
+``InstanceReader.read_until``, and decoded at once with NumPy; rows that do
+not fit the table format fall back to the line-by-line parser, which skips
+or reports them as before.
+
+Loaders tokenize an instance into such arrays first (see
+``DataLoader.tokenize_instance``), which is what the persistent parse cache
+stores, and assemble the domain objects from them afterwards.
+"""
+from __future__ import annotations
+
+import io
+from typing import Iterator
+
+import numpy as np
+
+_LABELS = ("depot", "product", "intersection")
+
+
+def _table(block: str, n_cols: int) -> np.ndarray | None:
+    """Float table of the first ``n_cols`` columns, or None if ragged."""
+    if not block.strip():
+        return np.empty((0, n_cols))
+    try:
+        return np.loadtxt(
+            io.StringIO(block), usecols=range(n_cols), comments="//", ndmin=2
+        )
+    except (ValueError, IndexError):
+        return None
+
+
+def edge_table(block: str) -> tuple[np.ndarray, np.ndarray]:
+    """Node pairs and lengths of an arcs or shortest path section."""
+    table = _table(block, 3)
+    if table is None:
+        table = np.array(_parse_triples(block), dtype=float).reshape(-1, 3)
+    return table[:, :2].astype(np.int64), np.ascontiguousarray(table[:, 2])
+
+
+def vertex_table(
+        block: str,
+        departing_depot: int,
+        arrival_depot: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ids, coordinates and node types of a vertex section."""
+    rows = [
+        row for row in map(str.strip, block.splitlines())
+        if row and not row.startswith("//")
+    ]
+    parts = [row.split() for row in rows]
+    if parts and all(len(row_parts) == 4 for row_parts in parts):
+        table = np.array(parts)
+        labels = np.char.strip(table[:, 3], '"')
+        try:
+            idx = table[:, 0].astype(np.int64)
+            xy = table[:, 1:3].astype(float)
+        except ValueError:
+            labels = None
+        if labels is not None and np.all(np.isin(labels, _LABELS)):
+            depot = labels == "depot"
+            start = depot & (idx == departing_depot)
+            end = depot & (idx == arrival_depot) & ~start
+            node_types = np.select(
+                [start, end, depot, labels == "product"],
+                ["start_node", "end_node", "depot_node", "pick_node"],
+                default="intersection",
+            )
+            xy[end, 0] += 1
+            return idx, xy, node_types
+
+    vertices = _parse_vertex_lines(rows, departing_depot, arrival_depot)
+    return (
+        np.array(list(vertices), dtype=np.int64),
+        np.array([(x, y) for x, y, _ in vertices.values()], dtype=float).reshape(-1, 2),
+        np.array([node_type for _, _, node_type in vertices.values()], dtype=str),
+    )
+
+
+def position_table(
+        orders: list[list[tuple[int, int]]],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Offsets, article ids and amounts of the positions of all orders."""
+    offsets = np.zeros(len(orders) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(positions) for positions in orders])
+    flat = np.array(
+        [position for positions in orders for position in positions],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    return offsets, np.ascontiguousarray(flat[:, 0]), np.ascontiguousarray(flat[:, 1])
+
+
+def edges_as_arcs(nodes: np.ndarray, lengths: np.ndarray) -> list[tuple[int, int, float]]:
+    return list(zip(nodes[:, 0].tolist(), nodes[:, 1].tolist(), lengths.tolist()))
+
+
+def edges_as_paths(nodes: np.ndarray, lengths: np.ndarray) -> dict[tuple[int, int], float]:
+    return dict(zip(zip(nodes[:, 0].tolist(), nodes[:, 1].tolist()), lengths.tolist()))
+
+
+def vertices_as_coords(
+        ids: np.ndarray,
+        xy: np.ndarray,
+        node_types: np.ndarray,
+) -> dict[int, tuple[float, float, str]]:
+    return {
+        i: (x, y, node_type)
+        for i, x, y, node_type in zip(
+            ids.tolist(), xy[:, 0].tolist(), xy[:, 1].tolist(), node_types.tolist()
+        )
+    }
+
+
+def iter_positions(
+        offsets: np.ndarray,
+        articles: np.ndarray,
+        amounts: np.ndarray,
+) -> Iterator[list[dict[str, int]]]:
+    """Positions of each order as ``{"article_id", "amount"}`` dicts."""
+    offsets = offsets.tolist()
+    articles = articles.tolist()
+    amounts = amounts.tolist()
+    for start, end in zip(offsets, offsets[1:]):
+        yield [
+            {"article_id": article_id, "amount": amount}
+            for article_id, amount in zip(articles[start:end], amounts[start:end])
+        ]
+
+
+def _parse_triples(block: str) -> list[tuple[int, int, float]]:
+    triples = []
+    for row in block.splitlines():
+        parts = row.split()
+        if len(parts) >= 3:
+            triples.append((int(parts[0]), int(parts[1]), float(parts[2])))
+    return triples
+
+
+def _parse_vertex_lines(
+        rows: list[str],
+        departing_depot: int,
+        arrival_depot: int,
+) -> dict[int, tuple[float, float, str]]:
+    vertices_coords = {}
+
+    for line in rows:
+        parts = line.split()
+
+        try:
+            idx = int(parts[0])
+            x = float(parts[1])
+            y = float(parts[2])
+            label = parts[3].strip('"')
+
+            match label:
+                case "depot":
+                    if idx == departing_depot:
+                        node_type = "start_node"
+                    elif idx == arrival_depot:
+                        node_type = "end_node"
+                        x += 1
+                    else:
+                        node_type = "depot_node"
+
+                case "product":
+                    node_type = "pick_node"
+
+                case "intersection":
+                    node_type = "intersection"
+
+                case _:
+                    raise ValueError(f"Unknown node type: {label}")
+
+            vertices_coords[idx] = (x, y, node_type)
+
+        except (ValueError, IndexError) as exc:
+            print(f"Warning: Error parsing vertex line: {line} — {exc}")
+
+    return vertices_coords
@@ -0,0 +1,45 @@
+"""Shortest path matrices of layout graphs.
+
+Layout graphs are sparse (aisles, cross aisles and the depots), so the
+distances are computed with Dijkstra from every node instead of the dense
+O(n^3) Floyd-Warshall. The predecessor matrix is only needed to expand
+tours, so it is computed on request, possibly long after the layout was
+built (see ``layout_cache.load_layout``).
+
+Distances equal those of Floyd-Warshall. Among shortest paths of equal
+length, however, Dijkstra picks a different predecessor than Floyd-Warshall
+did, so expanded tours may take a different, equally long route;
+``tests/test_shortest_paths.py`` pins the current choice.
+"""
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+
+def shortest_path_matrices(
+        graph: nx.Graph,
+        nodes: list,
+        with_predecessors: bool = False,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Distances between all ``nodes`` and, optionally, their predecessors.
+
+    Rows and columns follow ``nodes``; predecessors are indices into it,
+    with -9999 where there is none, as returned by scipy.
+    """
+    adjacency = nx.to_scipy_sparse_array(
+        graph,
+        nodelist=nodes,
+        weight="weight",
+        dtype=float,
+    )
+
+    if with_predecessors:
+        return dijkstra(adjacency, directed=False, return_predecessors=True)
+    return dijkstra(adjacency, directed=False), None
+
+
+def predecessor_matrix(graph: nx.Graph, nodes: list) -> np.ndarray:
+    _, predecessors = shortest_path_matrices(graph, nodes, with_predecessors=True)
+    return predecessors
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# First bytes of a pointer file. Pickles start with b"\x80", so a pointer can
+# never be mistaken for an artifact written without a store.
+POINTER_MAGIC = b"WOP-ARTIFACT\n"
+
+
+class ArtifactStore(ABC):
+    """Content-addressed storage for serialized task artifacts.
+
+    With a store active, ``dump_pickle`` writes the payload to the store and
+    only a small pointer file to the task target, so identical artifacts of
+    different tasks are stored once. ``load_pickle`` follows the pointer.
+    """
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """Store ``data`` unless present and return its key."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+
+class FileArtifactStore(ArtifactStore):
+    """Blobs named by their SHA-256 below ``root/<2 hex chars>/``."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _blob_path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def put(self, data: bytes) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(key)
+        if path.exists():
+            return key
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return key
+
+    def get(self, key: str) -> bytes:
+        with open(self._blob_path(key), "rb") as f:
+            return f.read()
+
+
+_ACTIVE_STORE: ArtifactStore | None = None
+
+
+def set_artifact_store(store: ArtifactStore | None) -> None:
+    global _ACTIVE_STORE
+    _ACTIVE_STORE = store
+
+
+def get_artifact_store() -> ArtifactStore | None:
+    return _ACTIVE_STORE
@@ -1,26 +1,111 @@
+import hashlib
 from os import makedirs
+from typing import ClassVar
 
 from cls_luigi.inhabitation_task import LuigiCombinator
 from os.path import join as pjoin
 from luigi import LocalTarget, Task
+from luigi.task import flatten
+from ware_ops_pipes.pipelines.memoization import memoized
 from ware_ops_pipes.pipelines.pipeline_params import PipelineParams
+from ware_ops_pipes.pipelines.prefetch import prefetched
+from ware_ops_pipes.pipelines.supervision import supervised
+from ware_ops_pipes.pipelines.target_manifest import (
+    get_manifest,
+    manifested,
+    sharded_target_path,
+)
 
 
 class BaseComponent(Task, LuigiCombinator):
     abstract = True
 
+    # Resource class claimed while the task runs, e.g. "exclusive_solver"
+    # for components that start a multi-threaded MILP solver. The runner
+    # limits the number of concurrently running tasks per class.
+    resource_class: ClassVar[str | None] = None
+
+    # Whether the outputs depend on nothing but the input files, the class
+    # and its parameters, so that memoization may reuse them.
+    memoizable: ClassVar[bool] = True
+
+    # (requirement, output) pairs of self.input() that run() reads. They are
+    # loaded concurrently before run() starts (see prefetch.prefetched).
+    prefetch_inputs: ClassVar[tuple[tuple[str, str], ...]] = ()
+
+    # Whether the component reconstructs paths and so needs the layout's
+    # predecessor matrix even without gen_tour. It is computed on first use
+    # (see layout_cache.load_layout).
+    needs_predecessors: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every concrete run() honours the per-task wall-clock and memory
+        # limits of the pipeline parameters (see supervision.supervised) and
+        # is skipped for already computed inputs (see memoization.memoized).
+        # With the sharded output layout, finished targets are added to the
+        # instance manifest (see target_manifest.manifested). Innermost,
+        # declared inputs are prefetched (see prefetch.prefetched).
+        if "run" in cls.__dict__:
+            cls.run = manifested(memoized(supervised(prefetched(cls.__dict__["run"]))))
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.pipeline_params = PipelineParams()
         makedirs(self.pipeline_params.output_folder, exist_ok=True)
 
+    @property
+    def resources(self) -> dict[str, int]:
+        if self.resource_class is None:
+            return {}
+        return {self.resource_class: 1}
+
+    @property
+    def task_id(self) -> str:
+        # Component parameters do not contain the instance, so the same task
+        # id is shared by all instances of a campaign. That is fine for a
+        # local scheduler, but a central scheduler shared by several runner
+        # processes must tell instances apart.
+        scope = self.task_scope()
+        if scope:
+            return f"{self._base_task_id}__{scope}"
+        return self._base_task_id
+
+    @task_id.setter
+    def task_id(self, value: str) -> None:
+        self._base_task_id = value
+
+    def complete(self) -> bool:
+        if self.pipeline_params.output_layout != "sharded":
+            return super().complete()
+
+        # Targets listed in the manifest are known to exist; only the others
+        # (e.g. shared layouts) are checked on the file system.
+        manifest = get_manifest(self.pipeline_params.output_folder)
+        return all(
+            manifest.contains(target.path) or target.exists()
+            for target in flatten(self.output())
+        )
+
+    def task_scope(self) -> str:
+        pipeline_params = getattr(self, "pipeline_params", None)
+        if pipeline_params is None or not pipeline_params.scope_task_ids:
+            return ""
+
+        raw = f"{pipeline_params.instance_set_name}/{pipeline_params.instance_name}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:10]
+
     def get_luigi_local_target_with_task_id(
             self,
             out_name
     ) -> LocalTarget:
+        if self.pipeline_params.output_layout == "sharded":
+            return LocalTarget(
+                sharded_target_path(self.pipeline_params.output_folder,
+                                    self._base_task_id, out_name)
+            )
         return LocalTarget(
             pjoin(self.pipeline_params.output_folder,
-                  self.task_id + "_" + out_name)
+                  self._base_task_id + "_" + out_name)
         )
-
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from contextlib import ExitStack, contextmanager
+from os.path import join as pjoin
+from typing import Iterator, NamedTuple
+
+from ware_ops_pipes.pipelines.io_helpers import file_lock
+
+try:
+    import fcntl
+except ImportError:  # Windows: advisory locking is not available
+    fcntl = None
+
+_MEMO_DIR = "_memo"
+
+
+def lock_path(path: str) -> str:
+    return f"{path}.lock"
+
+
+def lease_path(path: str) -> str:
+    return f"{path}.lease"
+
+
+@contextmanager
+def single_flight(path: str) -> Iterator[bool]:
+    """Serialize the construction of the shared cache entry ``path``.
+
+    Yields whether the caller has to build the entry. Concurrent builders,
+    also of other runner processes, block on the entry's lock file; when the
+    first one has written the entry, the others find it and reuse it::
+
+        with single_flight(path) as build:
+            if build:
+                ...  # write path atomically
+
+    The lock is released by the kernel if the builder dies.
+    """
+    with file_lock(lock_path(path)):
+        yield not os.path.exists(path)
+    touch_entry(path)
+
+
+@contextmanager
+def leased(path: str) -> Iterator[None]:
+    """Keep the cache entry ``path`` from being evicted within the block.
+
+    Readers of all processes may hold a lease on the same entry at once;
+    ``evict_data_cache`` skips entries with a lease. The lease is released
+    by the kernel if its holder dies.
+    """
+    fd = os.open(lease_path(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def touch_entry(path: str) -> None:
+    """Mark the entry ``path`` as used for the LRU eviction.
+
+    The lock file carries the usage time, since the mtime of the entry
+    itself tells processes whether their resident copy is current.
+    """
+    try:
+        os.utime(lock_path(path))
+    except FileNotFoundError:
+        open(lock_path(path), "a").close()
+
+
+class CacheEntry(NamedTuple):
+    path: str
+    files: list[str]
+    size: int
+    last_used: float
+
+
+def cache_entries(folder: str) -> list[CacheEntry]:
+    """Entries of a data cache folder, least recently used first.
+
+    A top-level entry consists of a file plus its companions named
+    ``<file>.<suffix>`` (lock, timing, memory-mapped matrices). Every
+    memoized stage output below ``_memo/`` is one entry as well.
+    """
+    if not os.path.isdir(folder):
+        return []
+
+    names = sorted(
+        entry.name for entry in os.scandir(folder) if entry.is_file()
+    )
+    # Sorted names place the companions right after their entry file.
+    groups: dict[str, list[str]] = {}
+    primary = None
+    for name in names:
+        if primary is not None and name.startswith(primary + "."):
+            groups[primary].append(name)
+        elif not name.endswith((".lock", ".lease")) and ".tmp." not in name:
+            # Temporary files belong to writes in progress.
+            primary = name
+            groups[name] = [name]
+
+    entries = []
+    for primary, members in groups.items():
+        path = pjoin(folder, primary)
+        files = [pjoin(folder, name) for name in members]
+        stamp = lock_path(path) if os.path.exists(lock_path(path)) else path
+        entries.append(CacheEntry(
+            path=path,
+            files=files,
+            size=sum(_size(file) for file in files),
+            last_used=_mtime(stamp),
+        ))
+
+    memo_root = pjoin(folder, _MEMO_DIR)
+    if os.path.isdir(memo_root):
+        for prefix in os.scandir(memo_root):
+            if not prefix.is_dir():
+                continue
+            for memo in os.scandir(prefix.path):
+                files = [entry.path for entry in os.scandir(memo.path) if entry.is_file()]
+                entries.append(CacheEntry(
+                    path=memo.path,
+                    files=files,
+                    size=sum(_size(file) for file in files),
+                    last_used=_mtime(pjoin(memo.path, "index.json")),
+                ))
+
+    entries.sort(key=lambda entry: entry.last_used)
+    return entries
+
+
+def evict_data_cache(folder: str, max_bytes: int) -> tuple[int, int]:
+    """Delete least recently used entries until ``folder`` fits ``max_bytes``.
+
+    Entries that are being built or read right now (see ``leased``) are
+    skipped. Returns the number and total size of the evicted entries.
+    """
+    entries = cache_entries(folder)
+    total = sum(entry.size for entry in entries)
+
+    n_evicted = n_bytes = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if os.path.isdir(entry.path):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        elif not _remove_unless_locked(entry):
+            continue
+        total -= entry.size
+        n_evicted += 1
+        n_bytes += entry.size
+    return n_evicted, n_bytes
+
+
+def _remove_unless_locked(entry: CacheEntry) -> bool:
+    with ExitStack() as stack:
+        for path in (lock_path(entry.path), lease_path(entry.path)):
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            stack.callback(os.close, fd)
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+                stack.callback(fcntl.flock, fd, fcntl.LOCK_UN)
+
+        # The entry file goes first, so it never looks complete while its
+        # companions are missing. The lock and lease files stay.
+        keep = {lock_path(entry.path), lease_path(entry.path)}
+        for file in sorted(entry.files, key=lambda f: f != entry.path):
+            if file not in keep:
+                try:
+                    os.remove(file)
+                except FileNotFoundError:
+                    pass
+        return True
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return time.time()
@@ -1,15 +1,142 @@
+import gzip
 import json
+import lzma
+import os
 import pickle
+import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Type, Dict, Any
+from typing import Type, Dict, Any, Callable, Iterator, NamedTuple
+
+from ware_ops_pipes.pipelines.artifact_store import POINTER_MAGIC, get_artifact_store
+from ware_ops_pipes.pipelines.pipeline_params import PipelineParams
+from ware_ops_pipes.pipelines.prefetch import MISSING, prefetched_artifact
+
+try:
+    import fcntl
+except ImportError:  # Windows: advisory locking is not available
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Codec(NamedTuple):
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+CODECS: dict[str, Codec] = {
+    "none": Codec(bytes, bytes),
+    "gzip": Codec(lambda data: gzip.compress(data, compresslevel=6), gzip.decompress),
+    "lzma": Codec(lzma.compress, lzma.decompress),
+}
+if zstandard is not None:
+    CODECS["zstd"] = Codec(
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+
+def register_codec(name: str, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]) -> None:
+    """Make a compression codec available to ``PipelineParams.pickle_codec``."""
+    CODECS[name] = Codec(compress, decompress)
+
+
+# First bytes of a framed pickle, followed by a JSON header line. Plain
+# pickles start with b"\x80" and are still read and written unchanged.
+FRAME_MAGIC = b"WOP-FRAME\n"
+_TMP_SUFFIX = re.compile(r"\.tmp\.\d+$")
+
+
+def artifact_codec(path: str) -> str:
+    """Codec configured for the artifact type of ``path``.
+
+    ``PipelineParams.pickle_codecs_json`` maps artifact names to codecs, e.g.
+    ``{"routing_sol": "lzma", "layout": "none"}``. A name matches targets
+    ending in ``<name>.pkl`` and cache entries starting with ``<name>__``.
+    """
+    params = PipelineParams()
+    basename = _TMP_SUFFIX.sub("", os.path.basename(path))
+    for name, codec in json.loads(params.pickle_codecs_json or "{}").items():
+        if basename.endswith(f"{name}.pkl") or basename.startswith(f"{name}__"):
+            return codec
+    return params.pickle_codec
+
+
+def encode_pickle(data: Any, codec: str = "none", protocol: int = pickle.DEFAULT_PROTOCOL) -> bytes:
+    """Serialize ``data``; framed unless it is a plain default pickle.
+
+    With protocol 5, NumPy arrays and other buffer providers are written out
+    of band behind the pickle stream instead of being copied into it.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, available: {sorted(CODECS)}")
+
+    if codec == "none" and protocol < 5:
+        return pickle.dumps(data, protocol=protocol)
+
+    buffers = []
+    payload = pickle.dumps(
+        data,
+        protocol=protocol,
+        buffer_callback=buffers.append if protocol >= 5 else None,
+    )
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    body = b"".join([payload, *raw_buffers])
+    header = {
+        "codec": codec,
+        "payload": len(payload),
+        "buffers": [buffer.nbytes for buffer in raw_buffers],
+    }
+    return FRAME_MAGIC + json.dumps(header).encode("utf-8") + b"\n" + CODECS[codec].compress(body)
+
+
+def decode_pickle(data: bytes | bytearray) -> Any:
+    """Inverse of ``encode_pickle``.
+
+    Out-of-band buffers are views into ``data``, so pass a bytearray if the
+    unpickled arrays must be writable.
+    """
+    if not data.startswith(FRAME_MAGIC):
+        return pickle.loads(data)
+
+    newline = data.index(b"\n", len(FRAME_MAGIC))
+    header = json.loads(data[len(FRAME_MAGIC):newline])
+    body = memoryview(data)[newline + 1:]
+    if header["codec"] != "none":
+        body = memoryview(bytearray(CODECS[header["codec"]].decompress(body)))
+
+    offset = header["payload"]
+    buffers = []
+    for size in header["buffers"]:
+        buffers.append(body[offset:offset + size])
+        offset += size
+    return pickle.loads(body[:header["payload"]], buffers=buffers)
 
 
 def load_pickle(
         path: str,
         mode: str = "rb"
 ) -> Any:
+    artifact = prefetched_artifact(path)
+    if artifact is not MISSING:
+        return artifact
+
     with open(path, mode) as f:
-        return pickle.load(f)
+        data = bytearray(os.fstat(f.fileno()).st_size)
+        f.readinto(data)
+
+    if not data.startswith(POINTER_MAGIC):
+        return decode_pickle(data)
+
+    key = data[len(POINTER_MAGIC):].decode("utf-8").strip()
+    store = get_artifact_store()
+    if store is None:
+        raise RuntimeError(f"{path} points to artifact {key}, but no artifact store is active")
+    return decode_pickle(bytearray(store.get(key)))
 
 
 def load_json(
@@ -17,6 +144,10 @@ def load_json(
         mode: str = "r"
 
 ) -> Dict:
+    artifact = prefetched_artifact(path)
+    if artifact is not MISSING:
+        return artifact
+
     with open(path, mode) as f:
         return json.load(f)
 
@@ -26,11 +157,15 @@ def dump_json(
         data: Dict,
         encoder_cls: Type[json.JSONEncoder] | None = None,
         mode: str = "w",
-        indent: int = 4
+        indent: int | None = 4,
+        compact: bool = False,
 
 ) -> None:
     with open(path, mode) as f:
-        json.dump(data, f, cls=encoder_cls, indent=indent)
+        if compact:
+            json.dump(data, f, cls=encoder_cls, separators=(",", ":"))
+        else:
+            json.dump(data, f, cls=encoder_cls, indent=indent)
 
 
 def dump_pickle(
@@ -38,8 +173,33 @@ def dump_pickle(
         data: Any,
         mode: str = "wb"
 ) -> None:
+    """Pickle ``data`` with the protocol and codec of ``PipelineParams``."""
+    encoded = encode_pickle(
+        data,
+        codec=artifact_codec(path),
+        protocol=PipelineParams().pickle_protocol,
+    )
+
+    store = get_artifact_store()
+    if store is not None:
+        encoded = POINTER_MAGIC + store.put(encoded).encode("utf-8")
+
     with open(path, mode) as f:
-        pickle.dump(data, f)
+        f.write(encoded)
+
+
+@contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """Hold an exclusive cross-process lock on ``path`` within the block."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
 
 
 def find_project_root() -> Path:
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from ware_ops_algos.domain_models import LayoutData
+
+from ware_ops_pipes.data_loaders.shortest_paths import predecessor_matrix
+from ware_ops_pipes.pipelines.data_cache import leased, single_flight, touch_entry
+from ware_ops_pipes.pipelines.io_helpers import dump_pickle, load_pickle
+from ware_ops_pipes.pipelines.prefetch import MISSING, prefetched_artifact
+
+LAYOUT_FORMATS = ("pickle", "npy")
+
+# Per-process LRU of deserialized layouts, keyed by the layout target path.
+# Disabled (size 0) unless a long-lived worker enables it, because a plain
+# Luigi run touches every layout only a handful of times.
+_LAYOUTS: OrderedDict[str, tuple[int, LayoutData]] = OrderedDict()
+_MAX_LAYOUTS = 0
+
+
+def layout_key(loader_name: str, loader_kwargs: dict, layout_signature: dict) -> str:
+    """Key of the cached layout shared by all instances with this signature."""
+    payload = {
+        "loader": loader_name,
+        "loader_kwargs": loader_kwargs,
+        "layout_signature": layout_signature,
+    }
+
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def set_layout_cache_size(size: int) -> None:
+    """Keep up to ``size`` layouts resident in this process."""
+    global _MAX_LAYOUTS
+    _MAX_LAYOUTS = max(0, size)
+    _evict()
+
+
+def layout_cache_enabled() -> bool:
+    return _MAX_LAYOUTS > 0
+
+
+def resident_layouts() -> list[str]:
+    return list(_LAYOUTS)
+
+
+def dump_layout(path: str, layout: LayoutData, layout_format: str = "pickle") -> None:
+    """Write a layout target, atomically.
+
+    With the ``npy`` format the distance and predecessor matrices are written
+    to ``<path>.dist.npy`` and ``<path>.pred.npy`` next to the pickled
+    remainder, and the distance matrix labels to ``<path>.nodes.pkl``.
+    ``load_layout`` memory-maps the matrices read-only, so all processes of a
+    host share their pages and nothing is deserialized.
+    """
+    if layout_format not in LAYOUT_FORMATS:
+        raise ValueError(f"Unknown layout format {layout_format!r}, expected one of {LAYOUT_FORMATS}")
+
+    if layout_format == "npy":
+        network = layout.layout_network
+        distance_matrix = network.distance_matrix
+        _save_npy(f"{path}.dist.npy", distance_matrix.to_numpy(dtype=float))
+        _dump_atomic(f"{path}.nodes.pkl", {
+            "index": distance_matrix.index,
+            "columns": distance_matrix.columns,
+        })
+        if network.predecessor_matrix is not None:
+            _save_npy(f"{path}.pred.npy", np.asarray(network.predecessor_matrix))
+
+        layout = copy.copy(layout)
+        layout.layout_network = copy.copy(network)
+        layout.layout_network.distance_matrix = None
+        layout.layout_network.predecessor_matrix = None
+
+    # The pickle is the Luigi target, so it is written last.
+    _dump_atomic(path, layout)
+
+
+def _save_npy(path: str, array: np.ndarray) -> None:
+    tmp_path = f"{path}.tmp.{os.getpid()}.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def _dump_atomic(path: str, data) -> None:
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    dump_pickle(tmp_path, data)
+    os.replace(tmp_path, path)
+
+
+def _read_layout(path: str) -> LayoutData:
+    # The lease keeps eviction from deleting companions halfway through.
+    with leased(path):
+        return _read_layout_files(path)
+
+
+def _read_layout_files(path: str) -> LayoutData:
+    layout = load_pickle(path)
+    network = layout.layout_network
+    if network.distance_matrix is not None or not os.path.exists(f"{path}.dist.npy"):
+        return layout
+
+    labels = load_pickle(f"{path}.nodes.pkl")
+    network.distance_matrix = pd.DataFrame(
+        np.load(f"{path}.dist.npy", mmap_mode="r"),
+        index=labels["index"],
+        columns=labels["columns"],
+        copy=False,
+    )
+    if os.path.exists(f"{path}.pred.npy"):
+        network.predecessor_matrix = np.load(f"{path}.pred.npy", mmap_mode="r")
+    return layout
+
+
+def load_layout(path: str, predecessors: bool = False) -> LayoutData:
+    """Load a cached layout, reusing the resident copy if it is still current.
+
+    Callers must treat the returned layout as read-only since it is shared by
+    every task of the process that uses the same layout. Matrices of the
+    ``npy`` format are read-only memory maps.
+
+    With ``predecessors`` a layout that was built without a predecessor
+    matrix gets one, which is computed by the first process that asks for
+    it and stored next to the layout for all others.
+    """
+    layout = _load_layout(path)
+    if predecessors and layout.layout_network.predecessor_matrix is None:
+        _attach_predecessors(path, layout)
+    return layout
+
+
+def _load_layout(path: str) -> LayoutData:
+    layout = prefetched_artifact(path)
+    if layout is not MISSING:
+        return layout
+
+    touch_entry(path)
+    if _MAX_LAYOUTS == 0:
+        return _read_layout(path)
+
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _LAYOUTS.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        _LAYOUTS.move_to_end(path)
+        return cached[1]
+
+    layout = _read_layout(path)
+    _LAYOUTS[path] = (mtime_ns, layout)
+    _LAYOUTS.move_to_end(path)
+    _evict()
+    return layout
+
+
+def _attach_predecessors(path: str, layout: LayoutData) -> None:
+    """Compute the predecessor matrix of a layout once per layout key.
+
+    The matrix is written to ``<path>.pred.npy`` for both layout formats,
+    since the pickle is the Luigi target and is not rewritten. Every process
+    memory-maps it from there, and it is evicted with its layout.
+    """
+    network = layout.layout_network
+    pred_path = f"{path}.pred.npy"
+    with leased(path), single_flight(pred_path) as build:
+        if build:
+            _save_npy(pred_path, predecessor_matrix(network.graph, network.node_list))
+        network.predecessor_matrix = np.load(pred_path, mmap_mode="r")
+
+
+def _evict() -> None:
+    while len(_LAYOUTS) > _MAX_LAYOUTS:
+        _LAYOUTS.popitem(last=False)
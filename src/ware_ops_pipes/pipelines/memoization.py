@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+from os.path import join as pjoin
+from typing import Callable
+
+from cls_luigi.inhabitation_task import ClsParameter
+from luigi.task import flatten
+
+from ware_ops_pipes.pipelines.io_helpers import dump_json, load_json
+
+_CHUNK_SIZE = 1 << 20
+
+
+def memoized(run: Callable) -> Callable:
+    """Wrap a component's ``run`` so identical stage inputs are computed once.
+
+    Differently parameterized upstream pipelines often hand a stage the very
+    same input files, but under different task ids, so Luigi would run the
+    stage again. With ``memoize`` set, the key of a task is the content hash
+    of its input files plus its class and parameters. Inputs from the shared
+    data cache, such as layouts, are named after their content and enter the
+    key by name only. On a hit the stored outputs are linked to the task
+    targets and ``run`` is skipped.
+    """
+
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        if not self.pipeline_params.memoize or not self.memoizable:
+            return run(self, *args, **kwargs)
+
+        key = memo_key(self)
+        if key is None:
+            return run(self, *args, **kwargs)
+
+        if _restore(self, key):
+            return None
+
+        _unlink_shared_outputs(self)
+        result = run(self, *args, **kwargs)
+        _store(self, key)
+        return result
+
+    return wrapper
+
+
+def memo_key(task) -> str | None:
+    """Content key of ``task``, or None for tasks without input files."""
+    input_paths = [
+        target.path for target in flatten(task.input()) if hasattr(target, "path")
+    ]
+    if not input_paths:
+        return None
+
+    params = task.pipeline_params
+    h = hashlib.sha256()
+    header = {
+        "class": f"{type(task).__module__}.{type(task).__qualname__}",
+        # Upstream components are covered by the input contents.
+        "params": {
+            name: task.param_kwargs[name] for name, param in task.get_params()
+            if not isinstance(param, ClsParameter)
+        },
+        "seed": params.seed,
+        "time_limit_sec": params.time_limit_sec,
+        "gen_tour": params.gen_tour,
+    }
+    h.update(json.dumps(header, sort_keys=True, default=str).encode("utf-8"))
+
+    for path in input_paths:
+        h.update(b"\0")
+        if _content_addressed(task, path):
+            h.update(os.path.basename(path).encode("utf-8"))
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                h.update(chunk)
+    return h.hexdigest()[:32]
+
+
+def _content_addressed(task, path: str) -> bool:
+    """Whether ``path`` is a data cache entry, e.g. ``layout__<layout key>.pkl``.
+
+    These are hundreds of MB for large layouts and named after their
+    content, so hashing their bytes is redundant.
+    """
+    cache_folder = task.pipeline_params.data_cache_folder
+    if not cache_folder:
+        return False
+    return os.path.dirname(os.path.abspath(path)) == os.path.abspath(cache_folder)
+
+
+def _memo_dir(task, key: str) -> str:
+    return pjoin(task.pipeline_params.data_cache_folder, "_memo", key[:2], key)
+
+
+def _output_paths(task) -> list[str]:
+    return [target.path for target in flatten(task.output())]
+
+
+def _restore(task, key: str) -> bool:
+    memo_dir = _memo_dir(task, key)
+    index_path = pjoin(memo_dir, "index.json")
+    if not os.path.exists(index_path):
+        return False
+
+    files = load_json(index_path)["files"]
+    output_paths = _output_paths(task)
+    if len(files) != len(output_paths):
+        return False
+
+    try:
+        for name, path in zip(files, output_paths):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            _link_or_copy(pjoin(memo_dir, name), tmp_path)
+            os.replace(tmp_path, path)
+        # Usage time for the LRU eviction of the data cache.
+        os.utime(index_path)
+    except FileNotFoundError:
+        # The entry was evicted from the data cache meanwhile.
+        return False
+    return True
+
+
+def _store(task, key: str) -> None:
+    memo_dir = _memo_dir(task, key)
+    if os.path.exists(pjoin(memo_dir, "index.json")):
+        return
+
+    os.makedirs(memo_dir, exist_ok=True)
+    files = []
+    for i, path in enumerate(_output_paths(task)):
+        if not os.path.exists(path):
+            # Partial outputs are not memoized.
+            return
+        name = f"{i}_{os.path.basename(path)}"
+        tmp_path = pjoin(memo_dir, f"{name}.tmp.{os.getpid()}")
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, pjoin(memo_dir, name))
+        files.append(name)
+
+    # The index is written last, so a memo entry is visible only when complete.
+    index_path = pjoin(memo_dir, "index.json")
+    tmp_path = f"{index_path}.tmp.{os.getpid()}"
+    dump_json(tmp_path, {"task_id": task.task_id, "files": files})
+    os.replace(tmp_path, index_path)
+
+
+def _unlink_shared_outputs(task) -> None:
+    # Outputs restored from the memo are hard links. Components overwrite
+    # their targets in place, which would also change the memo entry.
+    for path in _output_paths(task):
+        if os.path.exists(path) and os.stat(path).st_nlink > 1:
+            os.remove(path)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
@@ -1,4 +1,5 @@
 import json
+import pickle
 from os import getcwd
 from os.path import join as pjoin
 import luigi
@@ -41,7 +42,25 @@ class PipelineParams(luigi.Config):
 
     seed = luigi.IntParameter(default=42)
     time_limit_sec = luigi.OptionalIntParameter(default=None)
+    task_timeout_sec = luigi.OptionalIntParameter(default=None)
+    task_memory_limit_mb = luigi.OptionalIntParameter(default=None)
     gen_tour = luigi.BoolParameter(default=False)
+    scope_task_ids = luigi.BoolParameter(default=False)
+    racing = luigi.BoolParameter(default=False)
+    racing_tolerance = luigi.FloatParameter(default=0.0)
+    memoize = luigi.BoolParameter(default=False)
+    layout_format = luigi.Parameter(default="pickle")
+    # "flat" or "sharded" (<stage>/<hash prefix>/ directories plus manifest).
+    output_layout = luigi.Parameter(default="flat")
+
+    # Serialization of pickled artifacts and summaries (see io_helpers).
+    pickle_protocol = luigi.IntParameter(default=pickle.DEFAULT_PROTOCOL)
+    pickle_codec = luigi.Parameter(default="none")
+    pickle_codecs_json = luigi.Parameter(default="{}")
+    compact_json = luigi.BoolParameter(default=False)
+
+    # SQLite results store written by result aggregation, "" to disable.
+    results_db = luigi.Parameter(default="")
 
     instance_set_name = luigi.Parameter(default="")
     instance_name = luigi.Parameter(default="")
@@ -1,4 +1,5 @@
 import json
+import pickle
 from typing import Union, List
 
 from luigi.task import flatten
@@ -7,6 +8,7 @@ from cls.fcl import FiniteCombinatoryLogic
 from cls.subtypes import Subtypes
 from cls_luigi.inhabitation_task import RepoMeta
 
+from ware_ops_pipes.pipelines.artifact_store import ArtifactStore, set_artifact_store
 from ware_ops_pipes.pipelines.pipeline_params import PipelineParams, loader_name_from_cls
 
 
@@ -52,6 +54,20 @@ def set_pipeline_params(
     loader_kwargs: dict | None = None,
     time_limit_seconds: int | None = None,
     gen_tour: bool = False,
+    scope_task_ids: bool = False,
+    task_timeout_seconds: int | None = None,
+    task_memory_limit_mb: int | None = None,
+    racing: bool = False,
+    racing_tolerance: float = 0.0,
+    artifact_store: ArtifactStore | None = None,
+    memoize: bool = False,
+    layout_format: str = "pickle",
+    pickle_protocol: int = pickle.DEFAULT_PROTOCOL,
+    pickle_codec: str = "none",
+    pickle_codecs: dict[str, str] | None = None,
+    compact_json: bool = False,
+    results_db: str | None = None,
+    output_layout: str = "flat",
 ) -> None:
     global_parameters = PipelineParams()
 
@@ -70,4 +86,21 @@ def set_pipeline_params(
     )
 
     global_parameters.time_limit_sec = time_limit_seconds
+    global_parameters.task_timeout_sec = task_timeout_seconds
+    global_parameters.task_memory_limit_mb = task_memory_limit_mb
+    global_parameters.racing = racing
+    global_parameters.racing_tolerance = racing_tolerance
     global_parameters.gen_tour = gen_tour
+    global_parameters.scope_task_ids = scope_task_ids
+    global_parameters.memoize = memoize
+    global_parameters.layout_format = layout_format
+    global_parameters.pickle_protocol = pickle_protocol
+    global_parameters.pickle_codec = pickle_codec
+    global_parameters.pickle_codecs_json = json.dumps(pickle_codecs or {}, sort_keys=True)
+    global_parameters.compact_json = compact_json
+    global_parameters.results_db = results_db or ""
+    global_parameters.output_layout = output_layout
+
+    # Artifact stores are process state rather than a Luigi parameter, so
+    # that custom stores need not be serializable as strings.
+    set_artifact_store(artifact_store)
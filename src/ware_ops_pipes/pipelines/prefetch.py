@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+_MAX_FETCHERS = 4
+
+# Returned by prefetched_artifact for paths that were not prefetched.
+MISSING = object()
+
+# Artifacts of the running task, by path. Cleared when the task finishes.
+_ARTIFACTS: dict[str, Any] = {}
+
+
+def prefetched(run: Callable) -> Callable:
+    """Wrap a component's ``run`` so its declared inputs are loaded up front.
+
+    ``BaseComponent.prefetch_inputs`` lists ``(requirement, output)`` pairs
+    of ``self.input()``. They are loaded concurrently by a thread pool
+    before ``run`` starts, and ``load_pickle``, ``load_json`` and
+    ``load_layout`` return the prefetched objects instead of reading the
+    files again, so repeated loads within the task share one object.
+    """
+
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        if not self.prefetch_inputs:
+            return run(self, *args, **kwargs)
+
+        inputs = self.input()
+        specs = {
+            inputs[requirement][output].path: output
+            for requirement, output in self.prefetch_inputs
+        }
+        with ThreadPoolExecutor(
+                max_workers=min(_MAX_FETCHERS, len(specs)),
+                thread_name_prefix="prefetch",
+        ) as executor:
+            artifacts = dict(zip(specs, executor.map(_fetch, specs, specs.values())))
+
+        _ARTIFACTS.update(artifacts)
+        try:
+            return run(self, *args, **kwargs)
+        finally:
+            _ARTIFACTS.clear()
+
+    return wrapper
+
+
+def prefetched_artifact(path: str) -> Any:
+    """The prefetched object of ``path``, or ``MISSING``."""
+    return _ARTIFACTS.get(path, MISSING)
+
+
+def _fetch(path: str, output: str) -> Any:
+    # Imported here, as io_helpers and layout_cache consult this module.
+    if output == "layout":
+        from ware_ops_pipes.pipelines.layout_cache import load_layout
+        return load_layout(path)
+
+    from ware_ops_pipes.pipelines.io_helpers import load_json, load_pickle
+    if path.endswith(".json"):
+        return load_json(path)
+    return load_pickle(path)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import math
+import os
+from os.path import join as pjoin
+
+from ware_ops_pipes.pipelines.io_helpers import dump_json, file_lock, load_json
+
+INCUMBENT_FILE = "incumbent.json"
+
+
+class PipelineDominated(RuntimeError):
+    """Raised when a partial objective value can no longer beat the incumbent."""
+
+    def __init__(self, task_id: str, record: dict):
+        super().__init__(
+            f"{task_id} is dominated: partial value {record['partial_value']:.2f} "
+            f"exceeds incumbent {record['incumbent']:.2f}"
+        )
+        self.task_id = task_id
+        self.record = record
+
+
+def incumbent_path(output_folder: str) -> str:
+    return pjoin(output_folder, INCUMBENT_FILE)
+
+
+def read_incumbent(output_folder: str) -> float:
+    """Best objective value completed so far for the instance, or inf."""
+    path = incumbent_path(output_folder)
+    try:
+        return float(load_json(path)["value"])
+    except (OSError, ValueError, KeyError):
+        return math.inf
+
+
+def update_incumbent(output_folder: str, value: float) -> bool:
+    """Lower the instance incumbent to ``value``. Returns True if it improved."""
+    path = incumbent_path(output_folder)
+    with file_lock(f"{path}.lock"):
+        if value >= read_incumbent(output_folder):
+            return False
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        dump_json(tmp_path, {"value": value})
+        os.replace(tmp_path, path)
+    return True
+
+
+def reset_incumbent(output_folder: str, value: float = math.inf) -> None:
+    path = incumbent_path(output_folder)
+    with file_lock(f"{path}.lock"):
+        if math.isinf(value):
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        dump_json(tmp_path, {"value": value})
+        os.replace(tmp_path, path)
+
+
+def dominated_record_path(task) -> str:
+    return pjoin(task.pipeline_params.output_folder, f"{task._base_task_id}_dominated.json")
+
+
+def clear_dominated(task) -> None:
+    """Drop the dominated record of an earlier attempt of ``task``."""
+    path = dominated_record_path(task)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def check_dominated(task, partial_value: float) -> None:
+    """Abort ``task`` if its monotone partial value cannot beat the incumbent.
+
+    Only active in racing mode. The partial value must never decrease while
+    the task proceeds, e.g. the running sum of tour distances.
+    """
+    params = task.pipeline_params
+    if not params.racing:
+        return
+
+    incumbent = read_incumbent(params.output_folder)
+    if partial_value <= incumbent * (1.0 + params.racing_tolerance):
+        return
+
+    record = {
+        "status": "dominated",
+        "task_id": task.task_id,
+        "task_class": type(task).__name__,
+        "task_module": type(task).__module__,
+        "instance_name": params.instance_name,
+        "instance_set": params.instance_set_name,
+        "partial_value": partial_value,
+        "incumbent": incumbent,
+        "tolerance": params.racing_tolerance,
+    }
+    dump_json(dominated_record_path(task), record)
+    raise PipelineDominated(task.task_id, record)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+RESULTS_DB_FILE = "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    instance_set TEXT NOT NULL,
+    instance_name TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    pipeline_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    item_assignment_algo TEXT,
+    batching_algo TEXT,
+    routing_algo TEXT,
+    scheduling_algo TEXT,
+    total_distance REAL,
+    makespan REAL,
+    avg_tardiness REAL,
+    total_time REAL,
+    on_time_rate REAL,
+    summary TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (instance_set, instance_name, task_id)
+);
+CREATE INDEX IF NOT EXISTS results_pipeline
+    ON results (instance_set, instance_name, pipeline_id);
+"""
+
+# Stores opened by this process, by database path. Stores hold no open
+# connection, so forked task processes may keep using the parent's.
+_STORES: dict[Path, "ResultsStore"] = {}
+
+_STAGES = ["item_assignment_algo", "batching_algo", "routing_algo", "scheduling_algo"]
+_METRICS = ["makespan", "avg_tardiness", "total_time", "on_time_rate"]
+
+
+def pipeline_id(summary: dict) -> str:
+    stages = [summary.get(stage) for stage in _STAGES]
+    return "+".join(stage for stage in stages if stage is not None)
+
+
+class ResultsStore:
+    """SQLite table of pipeline results, one row per finished aggregation task.
+
+    Result aggregation tasks of all instances and processes write into the
+    same database, so ranking and evaluation read one indexed table instead
+    of tens of thousands of ``*summary.json`` files. The database runs in
+    WAL mode, which serializes writers and lets readers proceed; it must lie
+    on a local file system.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 60.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(
+            self,
+            instance_set: str,
+            instance_name: str,
+            task_id: str,
+            summary: dict,
+            status: str = "ok",
+    ) -> None:
+        """Insert or, for a rerun task, replace the result of ``task_id``."""
+        tours = summary.get("tours_summary", {})
+        row = (
+            instance_set,
+            instance_name,
+            task_id,
+            summary.get("pipeline_id") or pipeline_id(summary),
+            status,
+            *(summary.get(stage) for stage in _STAGES),
+            tours.get("total_distance"),
+            *(summary.get(metric) for metric in _METRICS),
+            json.dumps(summary, separators=(",", ":"), default=str),
+            time.time(),
+        )
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO results VALUES ({', '.join('?' * len(row))})",
+                row,
+            )
+
+    def discard(self, instance_set: str, instance_name: str, task_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM results WHERE instance_set = ? AND instance_name = ? AND task_id = ?",
+                (instance_set, instance_name, task_id),
+            )
+
+    def summaries(self, instance_set: str, instance_name: str) -> list[dict]:
+        """Summaries of the finished pipelines of one instance."""
+        return self._select(instance_set, instance_name, "status = 'ok'")
+
+    def terminal_records(self, instance_set: str, instance_name: str) -> list[dict]:
+        """Records of tasks that timed out, ran out of memory or were dominated."""
+        return self._select(instance_set, instance_name, "status != 'ok'")
+
+    def _select(self, instance_set: str, instance_name: str, condition: str) -> list[dict]:
+        query = (
+            "SELECT summary FROM results "
+            f"WHERE instance_set = ? AND instance_name = ? AND {condition}"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(query, (instance_set, instance_name))
+            return [json.loads(summary) for (summary,) in rows]
+
+    def frame(
+            self,
+            instance_sets: Iterable[str] | None = None,
+            instance_name: str | None = None,
+            with_summary: bool = False,
+    ) -> pd.DataFrame:
+        """Flat result columns for ranking and evaluation.
+
+        ``with_summary`` adds the parsed summaries as a ``summary`` column.
+        """
+        columns = ["instance_set", "instance_name", "task_id", "pipeline_id", "status",
+                   *_STAGES, "total_distance", *_METRICS]
+        if with_summary:
+            columns.append("summary")
+
+        query = f"SELECT {', '.join(columns)} FROM results WHERE 1 = 1"
+        params: list = []
+        if instance_sets is not None:
+            instance_sets = list(instance_sets)
+            query += f" AND instance_set IN ({', '.join('?' * len(instance_sets))})"
+            params += instance_sets
+        if instance_name is not None:
+            query += " AND instance_name = ?"
+            params.append(instance_name)
+
+        with self._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        if with_summary:
+            df["summary"] = df["summary"].map(json.loads)
+        return df
+
+
+def get_results_store(path: str | Path) -> ResultsStore:
+    """The store of ``path``, created and set up once per process."""
+    path = Path(path).resolve()
+    store = _STORES.get(path)
+    if store is None:
+        store = _STORES[path] = ResultsStore(path)
+    return store
+
+
+def record_result(task, summary: dict, status: str = "ok") -> None:
+    """Add a summary or a terminal record of ``task`` to the results store.
+
+    Does nothing unless ``PipelineParams.results_db`` is set.
+    """
+    params = task.pipeline_params
+    if not params.results_db:
+        return
+
+    get_results_store(params.results_db).record(
+        params.instance_set_name,
+        params.instance_name,
+        task._base_task_id,
+        summary,
+        status=status,
+    )
+
+
+def discard_result(task) -> None:
+    """Remove the row of ``task``, e.g. a stale terminal record of a rerun."""
+    params = task.pipeline_params
+    if not params.results_db:
+        return
+
+    get_results_store(params.results_db).discard(
+        params.instance_set_name,
+        params.instance_name,
+        task._base_task_id,
+    )
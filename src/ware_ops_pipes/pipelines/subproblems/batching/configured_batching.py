@@ -10,6 +10,7 @@ from ware_ops_algos.algorithms import (
 )
 from ware_ops_algos.domain_models import Articles, LayoutData, Resources
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
+from ware_ops_pipes.pipelines.layout_cache import load_layout
 from ware_ops_pipes.pipelines.templates.template_1 import MultiOrderBatching
 
 
@@ -17,6 +18,7 @@ class ConfiguredSeedBatching(MultiOrderBatching):
     """Abstract CLS-Luigi wrapper for configured SeedBatching variants."""
 
     abstract = True
+    prefetch_inputs = MultiOrderBatching.prefetch_inputs + (("instance", "layout"),)
 
     algorithm_card = None
 
@@ -30,7 +32,7 @@ class ConfiguredSeedBatching(MultiOrderBatching):
         resources: Resources = load_pickle(
             self.input()["instance"]["resources"].path
         )
-        layout: LayoutData = load_pickle(
+        layout: LayoutData = load_layout(
             self.input()["instance"]["layout"].path
         )
 
@@ -76,6 +78,7 @@ class ConfiguredSeedBatching(MultiOrderBatching):
 
 class ConfiguredLocalSearchBatching(MultiOrderBatching):
     abstract = True
+    prefetch_inputs = MultiOrderBatching.prefetch_inputs + (("instance", "layout"),)
 
     algorithm_card = None
     routing_class = None
@@ -89,8 +92,9 @@ class ConfiguredLocalSearchBatching(MultiOrderBatching):
         resources: Resources = load_pickle(
             self.input()["instance"]["resources"].path
         )
-        layout: LayoutData = load_pickle(
-            self.input()["instance"]["layout"].path
+        layout: LayoutData = load_layout(
+            self.input()["instance"]["layout"].path,
+            predecessors=self.needs_predecessors or self.pipeline_params.gen_tour,
         )
 
         if self.routing_class is None:
@@ -182,6 +186,7 @@ class ConfiguredLocalSearchBatching(MultiOrderBatching):
 
 class ConfiguredClarkAndWrightBatching(MultiOrderBatching):
     abstract = True
+    prefetch_inputs = MultiOrderBatching.prefetch_inputs + (("instance", "layout"),)
 
     algorithm_card = None
     routing_class = None
@@ -193,8 +198,9 @@ class ConfiguredClarkAndWrightBatching(MultiOrderBatching):
         resources: Resources = load_pickle(
             self.input()["instance"]["resources"].path
         )
-        layout: LayoutData = load_pickle(
-            self.input()["instance"]["layout"].path
+        layout: LayoutData = load_layout(
+            self.input()["instance"]["layout"].path,
+            predecessors=self.needs_predecessors or self.pipeline_params.gen_tour,
         )
 
         if self.routing_class is None:
@@ -2,15 +2,18 @@ from ware_ops_algos.algorithms import LocalSearchBatching, NearestNeighbourhoodR
 from ware_ops_algos.domain_models import Resources, LayoutData, Articles
 from ware_ops_pipes.pipelines.templates.template_1 import MultiOrderBatching
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
+from ware_ops_pipes.pipelines.layout_cache import load_layout
 
 
 class LSBatchingNNDueDate(MultiOrderBatching):
     abstract = False
+    needs_predecessors = True
+    prefetch_inputs = MultiOrderBatching.prefetch_inputs + (("instance", "layout"),)
 
     def get_inited_batcher(self):
         articles: Articles = load_pickle(self.input()["instance"]["articles"].path)
         resources: Resources = load_pickle(self.input()["instance"]["resources"].path)
-        layout: LayoutData = load_pickle(self.input()["instance"]["layout"].path)
+        layout: LayoutData = load_layout(self.input()["instance"]["layout"].path, predecessors=self.needs_predecessors)
         layout_network = layout.layout_network
         routing_kwargs = {
             "start_node": layout_network.start_node,
@@ -2,14 +2,16 @@ from ware_ops_algos.algorithms import MinMaxItemAssignment
 from ware_ops_algos.domain_models import StorageLocations, LayoutData
 from ware_ops_pipes.pipelines.templates.template_1 import AbstractItemAssignment
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
+from ware_ops_pipes.pipelines.layout_cache import load_layout
 
 
 class MinMaxIA(AbstractItemAssignment):
     abstract = False
+    prefetch_inputs = AbstractItemAssignment.prefetch_inputs + (("instance", "layout"),)
 
     def get_inited_item_assigner(self):
         storage_locations: StorageLocations = load_pickle(self.input()["instance"]["storage"].path)
-        layout: LayoutData = load_pickle(self.input()["instance"]["layout"].path)
+        layout: LayoutData = load_layout(self.input()["instance"]["layout"].path)
         layout_network = layout.layout_network
 
         item_assigner = MinMaxItemAssignment(
@@ -2,13 +2,15 @@ from ware_ops_algos.algorithms import NearestNeighborItemAssignment
 from ware_ops_algos.domain_models import LayoutData, StorageLocations
 from ware_ops_pipes.pipelines.templates.template_1 import AbstractItemAssignment
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
+from ware_ops_pipes.pipelines.layout_cache import load_layout
 
 
 class NNIA(AbstractItemAssignment):
     abstract = False
+    prefetch_inputs = AbstractItemAssignment.prefetch_inputs + (("instance", "layout"),)
 
     def get_inited_item_assigner(self):
-        layout: LayoutData = load_pickle(self.input()["instance"]["layout"].path)
+        layout: LayoutData = load_layout(self.input()["instance"]["layout"].path)
         storage: StorageLocations = load_pickle(self.input()["instance"]["storage"].path)
         layout_network = layout.layout_network
         item_assigner = NearestNeighborItemAssignment(
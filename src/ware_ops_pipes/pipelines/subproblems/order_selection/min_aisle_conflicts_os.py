@@ -4,14 +4,16 @@ from ware_ops_algos.domain_models import WarehouseInfo, Resources, LayoutData, R
 
 from ware_ops_pipes.pipelines.templates.template_1 import AbstractOrderSelection
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
+from ware_ops_pipes.pipelines.layout_cache import load_layout
 
 
 class MinAisleConflictsOS(AbstractOrderSelection):
     abstract = False
+    needs_predecessors = True
 
     def get_inited_order_selector(self):
         resources: Resources = load_pickle(self.input()["instance"]["resources"].path)
-        layout: LayoutData = load_pickle(self.input()["instance"]["layout"].path)
+        layout: LayoutData = load_layout(self.input()["instance"]["layout"].path, predecessors=self.needs_predecessors)
         layout_network = layout.layout_network
         warehouse_info: WarehouseInfo = load_pickle(self.input()["instance"]["warehouse_info"].path)
         tours: list[TourPlanningState] = warehouse_info.active_tours
@@ -3,6 +3,7 @@ from ware_ops_algos.domain_models import WarehouseInfo, Resources, LayoutData, R
 
 from ware_ops_pipes.pipelines.templates.template_1 import AbstractOrderSelection
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
+from ware_ops_pipes.pipelines.layout_cache import load_layout
 
 
 class MinDistOS(AbstractOrderSelection):
@@ -10,7 +11,7 @@ class MinDistOS(AbstractOrderSelection):
 
     def get_inited_order_selector(self):
         resources: Resources = load_pickle(self.input()["instance"]["resources"].path)
-        layout: LayoutData = load_pickle(self.input()["instance"]["layout"].path)
+        layout: LayoutData = load_layout(self.input()["instance"]["layout"].path)
         warehouse_info: WarehouseInfo = load_pickle(self.input()["instance"]["warehouse_info"].path)
         current_picker: Resource = warehouse_info.current_picker
         dima = layout.layout_network.distance_matrix
@@ -4,6 +4,8 @@ from ware_ops_pipes.pipelines.templates.template_1 import PickerRouting
 
 class ExactSolving(PickerRouting):
     abstract = False
+    resource_class = "exclusive_solver"
+    needs_predecessors = True
 
     def _get_inited_router(self):
         resources = self._load_resources()
@@ -4,6 +4,7 @@ from ware_ops_pipes.pipelines.templates.template_1 import CombinedBR
 
 class CombinedBatchingRoutingAssigning(CombinedBR):
     abstract = False
+    resource_class = "exclusive_solver"
 
     def _get_inited_router(self):
         resources = self._load_resources()
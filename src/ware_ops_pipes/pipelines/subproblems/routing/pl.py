@@ -7,6 +7,7 @@ from ware_ops_pipes.pipelines.io_helpers import load_pickle
 
 class PLRouting(PickerRouting):
     abstract = False
+    prefetch_inputs = PickerRouting.prefetch_inputs + (("instance", "warehouse_info"),)
 
     def _get_inited_router(self):
         resources = self._load_resources()
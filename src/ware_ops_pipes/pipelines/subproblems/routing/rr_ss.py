@@ -4,6 +4,7 @@ from ware_ops_pipes.pipelines.templates.template_1 import CombinedIAR
 
 class RatliffRosenthalNF(CombinedIAR):
     abstract = False
+    prefetch_inputs = CombinedIAR.prefetch_inputs + (("instance", "storage"),)
 
     def _get_inited_router(self):
         resources = self._load_resources()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from os.path import join as pjoin
+from typing import Callable
+
+from ware_ops_pipes.pipelines.io_helpers import dump_json
+
+# Set in supervised child processes so nested run() calls are executed inline.
+_IN_SUPERVISED_CHILD = False
+
+_POLL_INTERVAL_SEC = 0.1
+
+# Tail of a child traceback that is passed back to the parent.
+_MAX_ERROR_CHARS = 16_000
+
+
+class TaskLimitExceeded(RuntimeError):
+    """Raised when a supervised task breaches its wall-clock or memory limit."""
+
+    def __init__(self, status: str, task_id: str, record: dict):
+        super().__init__(f"{task_id} exceeded its {status} limit")
+        self.status = status
+        self.task_id = task_id
+        self.record = record
+
+
+def supervised(run: Callable) -> Callable:
+    """Wrap a component's ``run`` so it honours the pipeline task limits.
+
+    Without ``task_timeout_sec`` and ``task_memory_limit_mb`` the task runs
+    inline as before. Otherwise it runs in a forked child process that is
+    killed when it breaches a limit. A ``<task_id>_limit.json`` record is
+    written next to the task outputs, and the task fails so that its
+    dependents are not run. The runner reports every pipeline that depends
+    on the task as infeasible. Any other exception in the child is passed
+    back to the parent with its traceback.
+    """
+
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        params = self.pipeline_params
+        timeout_sec = params.task_timeout_sec
+        memory_limit_mb = params.task_memory_limit_mb
+
+        if _IN_SUPERVISED_CHILD:
+            return run(self, *args, **kwargs)
+
+        # A record from an earlier attempt is stale once the task reruns,
+        # also when it now runs without limits.
+        clear_limit_record(self)
+
+        if (
+                (timeout_sec is None and memory_limit_mb is None)
+                or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            return run(self, *args, **kwargs)
+
+        return _run_in_child(self, run, args, kwargs, timeout_sec, memory_limit_mb)
+
+    return wrapper
+
+
+def _child_main(task, run: Callable, args: tuple, kwargs: dict, error_conn) -> None:
+    global _IN_SUPERVISED_CHILD
+    _IN_SUPERVISED_CHILD = True
+    try:
+        run(task, *args, **kwargs)
+    except BaseException:
+        error_conn.send(traceback.format_exc()[-_MAX_ERROR_CHARS:])
+        raise
+    finally:
+        error_conn.close()
+
+
+def _run_in_child(
+        task,
+        run: Callable,
+        args: tuple,
+        kwargs: dict,
+        timeout_sec: int | None,
+        memory_limit_mb: int | None,
+) -> None:
+    ctx = multiprocessing.get_context("fork")
+    error_conn, child_error_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_child_main,
+        args=(task, run, args, kwargs, child_error_conn),
+        name=f"supervised-{task.task_id}",
+    )
+
+    t0 = time.perf_counter()
+    process.start()
+    child_error_conn.close()
+
+    status = None
+    peak_rss_mb = 0.0
+    while True:
+        process.join(_POLL_INTERVAL_SEC)
+        elapsed = time.perf_counter() - t0
+
+        if not process.is_alive():
+            break
+
+        rss_mb = _rss_mb(process.pid)
+        if rss_mb is not None:
+            peak_rss_mb = max(peak_rss_mb, rss_mb)
+
+        if timeout_sec is not None and elapsed > timeout_sec:
+            status = "timeout"
+        elif memory_limit_mb is not None and rss_mb is not None and rss_mb > memory_limit_mb:
+            status = "oom"
+
+        if status is not None:
+            _stop(process)
+            break
+
+    # A SIGKILL we did not send is most likely the kernel OOM killer.
+    if status is None and process.exitcode == -signal.SIGKILL:
+        status = "oom"
+
+    try:
+        error = error_conn.recv() if error_conn.poll() else ""
+    except EOFError:
+        error = ""
+    error_conn.close()
+
+    if status is not None:
+        record = {
+            "status": status,
+            "task_id": task.task_id,
+            "task_class": type(task).__name__,
+            "task_module": type(task).__module__,
+            "instance_name": task.pipeline_params.instance_name,
+            "instance_set": task.pipeline_params.instance_set_name,
+            "elapsed_time": elapsed,
+            "peak_rss_mb": peak_rss_mb,
+            "time_limit_sec": timeout_sec,
+            "memory_limit_mb": memory_limit_mb,
+        }
+        dump_json(limit_record_path(task), record)
+        raise TaskLimitExceeded(status, task.task_id, record)
+
+    if process.exitcode != 0:
+        raise RuntimeError(
+            f"{task.task_id} failed in supervised process "
+            f"(exit code {process.exitcode})"
+            + (f"\n{error}" if error else "")
+        )
+
+
+def limit_record_path(task) -> str:
+    return pjoin(task.pipeline_params.output_folder, f"{task._base_task_id}_limit.json")
+
+
+def clear_limit_record(task) -> None:
+    """Drop the limit record of an earlier attempt of ``task``."""
+    path = limit_record_path(task)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _stop(process) -> None:
+    process.terminate()
+    process.join(5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+def _rss_mb(pid: int) -> float | None:
+    """Resident set size of ``pid`` in MB, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+from os.path import join as pjoin
+from pathlib import Path
+from typing import Callable
+
+from luigi.task import flatten
+
+from ware_ops_pipes.pipelines.io_helpers import file_lock
+
+MANIFEST_FILE = "manifest.jsonl"
+
+
+def sharded_target_path(output_folder: str, task_id: str, out_name: str) -> str:
+    """``<output_folder>/<stage>/<hash prefix>/<task_id>_<out_name>``.
+
+    The stage directory is named after the output (``routing_sol``,
+    ``summary``, ...) and the two hex characters of the task id hash spread
+    the targets of one stage over at most 256 directories.
+    """
+    stage = out_name.split(".", 1)[0]
+    prefix = hashlib.sha256(task_id.encode("utf-8")).hexdigest()[:2]
+    return pjoin(output_folder, stage, prefix, f"{task_id}_{out_name}")
+
+
+class TargetManifest:
+    """Append-only list of the finished targets below one instance folder.
+
+    Each line is ``{"path": <relative path>, "kind": <stage directory>}``,
+    or additionally has ``"removed": true`` for a target deleted later. The
+    file is read incrementally, so checking a target never lists or stats a
+    directory once the manifest is loaded.
+    """
+
+    def __init__(self, output_folder: str):
+        self.output_folder = output_folder
+        self.path = pjoin(output_folder, MANIFEST_FILE)
+        self._offset = 0
+        self._entries: dict[str, str] = {}
+
+    def _refresh(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size < self._offset:
+            # Manifest was truncated or replaced; start over.
+            self._offset = 0
+            self._entries.clear()
+        if size == self._offset:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        # Only consume complete lines, a writer may still be appending.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            entry = json.loads(line)
+            if entry.get("removed"):
+                self._entries.pop(entry["path"], None)
+            else:
+                self._entries[entry["path"]] = entry["kind"]
+        self._offset += end
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.output_folder)
+
+    def contains(self, path: str) -> bool:
+        relative = self._relative(path)
+        if relative not in self._entries:
+            self._refresh()
+        return relative in self._entries
+
+    def paths(self, kind: str) -> list[str]:
+        self._refresh()
+        return [
+            pjoin(self.output_folder, relative)
+            for relative, entry_kind in self._entries.items()
+            if entry_kind == kind
+        ]
+
+    def record(self, paths: list[str]) -> None:
+        self._append(paths, removed=False)
+
+    def discard(self, paths: list[str]) -> None:
+        """Mark deleted targets, so that their tasks are run again if needed."""
+        self._append(paths, removed=True)
+
+    def _append(self, paths: list[str], removed: bool) -> None:
+        lines = []
+        for path in paths:
+            relative = self._relative(path)
+            if relative.startswith(os.pardir):
+                # Shared targets outside the instance folder, e.g. layouts.
+                continue
+            entry = {"path": relative, "kind": relative.split(os.sep, 1)[0]}
+            if removed:
+                entry["removed"] = True
+                self._entries.pop(relative, None)
+            lines.append(json.dumps(entry) + "\n")
+        if not lines:
+            return
+
+        with file_lock(f"{self.path}.lock"):
+            with open(self.path, "a") as f:
+                f.writelines(lines)
+
+
+_MANIFESTS: dict[str, TargetManifest] = {}
+
+
+def get_manifest(output_folder: str) -> TargetManifest:
+    manifest = _MANIFESTS.get(output_folder)
+    if manifest is None:
+        manifest = _MANIFESTS[output_folder] = TargetManifest(output_folder)
+    return manifest
+
+
+def summary_paths(output_folder: str | Path) -> list[str]:
+    """Summary files of one instance folder, from its manifest if it has one."""
+    output_folder = str(output_folder)
+    if os.path.exists(pjoin(output_folder, MANIFEST_FILE)):
+        return get_manifest(output_folder).paths("summary")
+    return [str(path) for path in Path(output_folder).glob("*summary.json")]
+
+
+def manifested(run: Callable) -> Callable:
+    """Record the outputs of a successful ``run`` in the instance manifest."""
+
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        params = self.pipeline_params
+        if params.output_layout != "sharded":
+            return run(self, *args, **kwargs)
+
+        paths = [target.path for target in flatten(self.output())]
+        for directory in {os.path.dirname(path) for path in paths}:
+            os.makedirs(directory, exist_ok=True)
+
+        result = run(self, *args, **kwargs)
+        get_manifest(params.output_folder).record(paths)
+        return result
+
+    return wrapper
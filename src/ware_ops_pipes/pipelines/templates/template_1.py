@@ -1,6 +1,4 @@
 import os
-import hashlib
-import json
 import time
 from pathlib import Path
 
@@ -16,13 +14,18 @@ from ware_ops_algos.algorithms import Batching, Routing, \
 from ware_ops_algos.domain_models import OrdersDomain, Resources, LayoutData, Articles, StorageLocations
 from ware_ops_algos.domain_models.base_domain import BaseWarehouseDomain
 from ware_ops_pipes.pipelines import BaseComponent
+from ware_ops_pipes.pipelines.data_cache import single_flight
 from ware_ops_pipes.pipelines.io_helpers import dump_pickle, load_pickle, load_json, dump_json
+from ware_ops_pipes.pipelines.layout_cache import dump_layout, layout_key, load_layout
 from ware_ops_pipes.pipelines.pipeline_params import get_loader_cls
+from ware_ops_pipes.pipelines.results_store import record_result
+from ware_ops_pipes.pipelines.racing import check_dominated, clear_dominated, update_incumbent
 from ware_ops_pipes.synthesis.pipeline_provenance import collect_from_graph
 
 
 class LayoutLoader(BaseComponent):
     abstract = False
+    memoizable = False
 
     def _loader(self):
         if not self.pipeline_params.loader_name:
@@ -39,17 +42,22 @@ class LayoutLoader(BaseComponent):
         )
 
     def _layout_key(self) -> str:
+        # Luigi calls output() many times per task; the signature is read
+        # from the instance header or layout sections once per process.
         loader = self._loader()
-        parsed = loader.parse_instance(Path(self.pipeline_params.instance_path))
 
-        payload = {
-            "loader": self.pipeline_params.loader_name,
-            "loader_kwargs": self.pipeline_params.loader_kwargs(),
-            "layout_signature": loader.layout_signature(parsed),
-        }
+        return layout_key(
+            self.pipeline_params.loader_name,
+            self.pipeline_params.loader_kwargs(),
+            loader.instance_layout_signature(Path(self.pipeline_params.instance_path)),
+        )
 
-        raw = json.dumps(payload, sort_keys=True, default=str)
-        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    def task_scope(self) -> str:
+        # Instances sharing a layout share the cached layout target, so a
+        # central scheduler may deduplicate them across runner processes.
+        if not super().task_scope():
+            return ""
+        return self._layout_key()
 
     def output(self):
         if not self.pipeline_params.data_cache_folder:
@@ -65,29 +73,38 @@ class LayoutLoader(BaseComponent):
         }
 
     def run(self):
+        target = self.output()["layout"]
+        os.makedirs(os.path.dirname(target.path), exist_ok=True)
+
+        # Runner processes and workers that share the data cache build each
+        # layout once; the others wait here and reuse it.
+        with single_flight(target.path) as build:
+            if build:
+                self._build(target.path)
+
+    def _build(self, path: str) -> None:
         loader = self._loader()
 
         t0 = time.perf_counter()
-        parsed = loader.parse_instance(Path(self.pipeline_params.instance_path))
+        parsed = loader.parse_instance_cached(
+            Path(self.pipeline_params.instance_path),
+            cache_dir=self.pipeline_params.data_cache_folder,
+        )
         t_parse = time.perf_counter() - t0
 
         t1 = time.perf_counter()
-        layout = loader.build_layout(parsed)
+        # Without gen_tour the predecessors are computed lazily by the
+        # routers that need them (see load_layout).
+        layout = loader.build_layout(
+            parsed,
+            with_predecessors=self.pipeline_params.gen_tour,
+        )
         t_build = time.perf_counter() - t1
 
-        if not self.pipeline_params.gen_tour:
-            # layout.layout_network.graph = None
-            layout.layout_network.predecessor_matrix = None
-
-        target = self.output()["layout"]
-        os.makedirs(os.path.dirname(target.path), exist_ok=True)
-
-        tmp_path = f"{target.path}.tmp.{os.getpid()}"
-        dump_pickle(tmp_path, layout)
-        os.replace(tmp_path, target.path)
+        dump_layout(path, layout, self.pipeline_params.layout_format)
 
         dump_json(
-            f"{target.path}.timing.json",
+            f"{path}.timing.json",
             {
                 "parse_time": t_parse,
                 "build_time": t_build,
@@ -98,6 +115,7 @@ class LayoutLoader(BaseComponent):
 
 class InstanceLoader(BaseComponent):
     abstract = False
+    memoizable = False
 
     layout_loader = ClsParameter(tpe=LayoutLoader.return_type())
 
@@ -127,10 +145,13 @@ class InstanceLoader(BaseComponent):
         loader = self._loader()
 
         t0 = time.perf_counter()
-        parsed = loader.parse_instance(Path(self.pipeline_params.instance_path))
+        parsed = loader.parse_instance_cached(
+            Path(self.pipeline_params.instance_path),
+            cache_dir=self.pipeline_params.data_cache_folder,
+        )
         t_parse = time.perf_counter() - t0
 
-        layout = load_pickle(
+        layout = load_layout(
             self.input()["layout_loader"]["layout"].path
         )
 
@@ -166,6 +187,7 @@ class InstanceLoader(BaseComponent):
 class AbstractItemAssignment(BaseComponent):
     abstract = True
     instance = ClsParameter(tpe=InstanceLoader.return_type())
+    prefetch_inputs = (("instance", "orders"), ("instance", "storage"))
 
     def get_inited_item_assigner(self) -> ItemAssignment:
         ...
@@ -237,6 +259,11 @@ class SingleOrderBatching(AbstractBatching):
 
 class MultiOrderBatching(AbstractBatching):
     abstract = True
+    prefetch_inputs = (
+        ("item_assignment_sol", "item_assignment_sol"),
+        ("instance", "articles"),
+        ("instance", "resources"),
+    )
 
     def get_inited_batcher(self) -> Batching:
         ...
@@ -296,7 +323,10 @@ class AbstractPickerRouting(BaseComponent):
         return load_pickle(self.input()["routing_input"]["routing_input"].path)
 
     def _load_layout(self) -> LayoutData:
-        return load_pickle(self.input()["instance"]["layout"].path)
+        return load_layout(
+            self.input()["instance"]["layout"].path,
+            predecessors=self.needs_predecessors or self.pipeline_params.gen_tour,
+        )
 
     def _load_articles(self) -> Articles:
         return load_pickle(self.input()["instance"]["articles"].path)
@@ -308,6 +338,11 @@ class AbstractPickerRouting(BaseComponent):
 class PickerRouting(AbstractPickerRouting):
     abstract = True
     batching_sol = ClsParameter(tpe=AbstractBatching.return_type())
+    prefetch_inputs = (
+        ("batching_sol", "batching_sol"),
+        ("instance", "resources"),
+        ("instance", "layout"),
+    )
 
     def requires(self):
         return {
@@ -323,6 +358,8 @@ class PickerRouting(AbstractPickerRouting):
         )
 
         routing_sols = []
+        clear_dominated(self)
+        total_distance = 0.0
 
         for i, batch in enumerate(batching_sol.batches):
             routing_solution = router.solve(batch.pick_positions)
@@ -330,6 +367,11 @@ class PickerRouting(AbstractPickerRouting):
             routing_sols.append(routing_solution)
             router.reset_parameters()
 
+            # The running distance only grows, so racing mode can abort as
+            # soon as it exceeds the best complete pipeline.
+            total_distance += float(routing_solution.route.distance)
+            check_dominated(self, total_distance)
+
         dump_pickle(
             self.output()["routing_sol"].path,
             routing_sols,
@@ -338,6 +380,11 @@ class PickerRouting(AbstractPickerRouting):
 
 class CombinedIAR(AbstractPickerRouting):
     abstract = True
+    prefetch_inputs = (
+        ("instance", "orders"),
+        ("instance", "resources"),
+        ("instance", "layout"),
+    )
 
     def requires(self):
         return {
@@ -355,6 +402,8 @@ class CombinedIAR(AbstractPickerRouting):
             for pp in order.order_positions:
                 pl.append(pp)
             pick_lists.append(pl)
+        clear_dominated(self)
+        total_distance = 0.0
         for i, pick_list in enumerate(pick_lists):
             routing_solution = router.solve(pick_list)
             # routing_solution.route.pick_list = pl
@@ -362,12 +411,20 @@ class CombinedIAR(AbstractPickerRouting):
 
             router.reset_parameters()
 
+            total_distance += float(routing_solution.route.distance)
+            check_dominated(self, total_distance)
+
         dump_pickle(self.output()["routing_sol"].path, routing_sols)
 
 
 class CombinedBR(AbstractPickerRouting):
     abstract = True
     item_assignment_sol = ClsParameter(tpe=AbstractItemAssignment.return_type())
+    prefetch_inputs = (
+        ("item_assignment_sol", "item_assignment_sol"),
+        ("instance", "resources"),
+        ("instance", "layout"),
+    )
 
     def requires(self):
         return {
@@ -397,6 +454,7 @@ class AbstractScheduling(BaseComponent):
     abstract = True
     routing_sol = ClsParameter(tpe=AbstractPickerRouting.return_type())
     instance = ClsParameter(tpe=InstanceLoader.return_type())
+    prefetch_inputs = (("routing_sol", "routing_sol"), ("instance", "resources"))
 
     def requires(self):
         return {
@@ -449,6 +507,8 @@ class AbstractScheduling(BaseComponent):
 
 class AbstractResultAggregation(BaseComponent):
     abstract = True
+    # Summaries carry the instance name and the provenance of the pipeline.
+    memoizable = False
 
     def output(self):
         return {
@@ -498,7 +558,7 @@ class AbstractResultAggregation(BaseComponent):
                 orders = load_pickle(instance_task.output()["orders"].path)
                 resources = load_pickle(instance_task.output()["resources"].path)
                 storage = load_pickle(instance_task.output()["storage"].path)
-                layout = load_pickle(instance_task.output()["layout"].path)
+                layout = load_layout(instance_task.output()["layout"].path)
 
                 gd = getattr(layout, "graph_data", None)
                 features = {
@@ -636,7 +696,14 @@ class ResultAggregationDistance(AbstractResultAggregation):
         elif isinstance(sol, CombinedRoutingSolution):
             summary["tours_summary"] = self._compute_tour_summary_from_combined(sol)
 
-        dump_json(self.output()["summary"].path, summary)
+        dump_json(self.output()["summary"].path, summary, compact=self.pipeline_params.compact_json)
+        record_result(self, summary)
+
+        if self.pipeline_params.racing and "tours_summary" in summary:
+            update_incumbent(
+                self.pipeline_params.output_folder,
+                summary["tours_summary"]["total_distance"],
+            )
 
 
 class ResultAggregationDueDate(AbstractResultAggregation):
@@ -743,7 +810,8 @@ class ResultAggregationDueDate(AbstractResultAggregation):
             summary["avg_tardiness"] = 0.0
             summary["max_lateness"] = 0.0
             summary["max_tardiness"] = 0.0
-            dump_json(self.output()["summary"].path, summary)
+            dump_json(self.output()["summary"].path, summary, compact=self.pipeline_params.compact_json)
+            record_result(self, summary)
             return
 
         summary["on_time_rate"] = float(due_eval["on_time"].mean() * 100.0)
@@ -768,7 +836,8 @@ class ResultAggregationDueDate(AbstractResultAggregation):
             str(k): float(v) for k, v in picker_util.items()
         }
 
-        dump_json(self.output()["summary"].path, summary)
+        dump_json(self.output()["summary"].path, summary, compact=self.pipeline_params.compact_json)
+        record_result(self, summary)
 
 
 
@@ -8,6 +8,8 @@ from typing import Any, Dict
 import pandas as pd
 
 from ware_ops_pipes.pipelines.io_helpers import load_json
+from ware_ops_pipes.pipelines.results_store import ResultsStore, pipeline_id
+from ware_ops_pipes.pipelines.target_manifest import summary_paths
 
 
 class Metric(ABC):
@@ -78,9 +80,15 @@ class RankingEvaluator:
         instance_name: str,
         data_card: Any,
         taxonomy: dict,
+        instance_set: str | None = None,
+        results_store: ResultsStore | None = None,
     ):
         self.output_dir = Path(output_dir)
         self.instance_name = instance_name
+        # With a results store the summaries and terminal records of the
+        # instance are read from it instead of from the output directory.
+        self.instance_set = instance_set
+        self.results_store = results_store
         self.data_card = data_card
         self.taxonomy = taxonomy
         self.df_result: pd.DataFrame | None = None
@@ -94,8 +102,7 @@ class RankingEvaluator:
     def evaluate(self) -> pd.DataFrame:
         results = []
 
-        for file in self.output_dir.glob("*summary.json"):
-            summary = load_json(str(file))
+        for summary in self._summaries():
             value = self.metric.compute(summary)
 
             pipeline_id = self._pipeline_id(summary)
@@ -111,9 +118,27 @@ class RankingEvaluator:
                 "batching_algo": summary.get("batching_algo"),
                 "routing_algo": summary.get("routing_algo"),
                 "scheduling_algo": summary.get("scheduling_algo"),
+                "status": "ok",
                 "value": value,
             })
 
+        # Pipelines with a task killed for breaching a hard time or memory
+        # limit, or aborted as dominated in racing mode, have a terminal
+        # record instead of a summary; report them as infeasible.
+        for record in self._terminal_records():
+            results.append({
+                "pipeline_id": record.get("pipeline_id"),
+                "problem_class": self.problem_class,
+                "objective": self.objective,
+                "metric": self.metric.name,
+                "item_assignment_algo": record.get("item_assignment_algo"),
+                "batching_algo": record.get("batching_algo"),
+                "routing_algo": record.get("routing_algo"),
+                "scheduling_algo": record.get("scheduling_algo"),
+                "status": record.get("status"),
+                "value": self._infeasible_value(),
+            })
+
         if not results:
             print(f"No results found in {self.output_dir}")
             return pd.DataFrame()
@@ -144,6 +169,19 @@ class RankingEvaluator:
         self.df_result = df
         return df
 
+    def _summaries(self) -> list[Dict]:
+        if self.results_store is not None:
+            return self.results_store.summaries(self.instance_set, self.instance_name)
+        return [load_json(path) for path in summary_paths(self.output_dir)]
+
+    def _terminal_records(self) -> list[Dict]:
+        if self.results_store is not None:
+            return self.results_store.terminal_records(self.instance_set, self.instance_name)
+        return [load_json(str(file)) for file in self.output_dir.glob("*_terminal.json")]
+
+    def _infeasible_value(self) -> float:
+        return math.inf if self.metric.direction == "min" else -math.inf
+
     def _validate_objective(self) -> None:
         if self.problem_class not in self.taxonomy:
             raise ValueError(
@@ -176,11 +214,4 @@ class RankingEvaluator:
 
     @staticmethod
     def _pipeline_id(summary: Dict) -> str:
-        stages = [
-            summary.get("item_assignment_algo"),
-            summary.get("batching_algo"),
-            summary.get("routing_algo"),
-            summary.get("scheduling_algo"),
-        ]
-
-        return "+".join(stage for stage in stages if stage is not None)
\ No newline at end of file
+        return pipeline_id(summary)
\ No newline at end of file
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import os
+import time
+import tomllib
+from pathlib import Path
+from typing import Tuple
+
+from ware_ops_algos.domain_models import load_and_flatten_data_card
+
+from ware_ops_pipes.pipelines.artifact_store import FileArtifactStore
+from ware_ops_pipes.pipelines.io_helpers import dump_json, file_lock
+from ware_ops_pipes.pipelines.pipeline_params import get_loader_cls
+from ware_ops_pipes.synthesis.runner import PipelineRunner
+from ware_ops_pipes.synthesis.warm_pool import WarmWorkerPool
+
+# Settings of a [[sets]] entry that are not PipelineRunner arguments.
+_SET_KEYS = {"name", "instances_dir", "data_card", "loader", "pattern"}
+
+
+def load_campaign_spec(path: str | Path) -> dict:
+    """Read a campaign spec from a TOML or YAML file."""
+    path = Path(path)
+    if path.suffix == ".toml":
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML campaign specs require PyYAML (pip install pyyaml)") from None
+        with open(path, "r") as f:
+            return yaml.safe_load(f)
+
+    raise ValueError(f"Unsupported campaign spec format: {path.suffix!r}")
+
+
+class GlobRunner(PipelineRunner):
+    """Runner whose instances are the files matching a glob pattern."""
+
+    def __init__(self, *args, pattern: str = "*.txt", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pattern = pattern
+
+    def discover_instances(self) -> list[Tuple[str, list[Path]]]:
+        instances = []
+        for filepath in self.instances_dir.glob(self.pattern):
+            if filepath.is_file():
+                instances.append((filepath.stem, [filepath]))
+        return instances
+
+
+class Campaign:
+    """Run several instance sets concurrently under one worker budget.
+
+    A spec looks like::
+
+        name = "all_experiments"
+        workers = 16            # global number of instance processes
+        layout_cache_size = 4
+        artifact_store = true   # content-addressed task outputs
+
+        [defaults]              # PipelineRunner arguments for every set
+        time_limit_sec = 240
+        excluded = ["ExactSolving"]
+
+        [[sets]]
+        name = "SPRP"
+        instances_dir = "data/instances/SPRP"
+        data_card = "data/data_cards/sprp.yaml"
+        loader = "hessler"
+        instance_workers = 4    # cap of this set within the budget
+        loader_kwargs = { mirror_top_depot = true }
+
+    Relative paths are resolved against ``project_root``. All sets share one
+    warm worker pool, so sets with identical layouts also share resident
+    layouts, and all of them use the same ``_data_cache``. ``workers``
+    overrides the budget of the spec; it has to be known before the runners
+    are built, since each set's ``instance_workers`` is capped by it.
+    """
+
+    def __init__(self, spec: dict, project_root: Path, workers: int | None = None):
+        self.spec = spec
+        self.name = spec.get("name", "campaign")
+        self.project_root = Path(project_root)
+        self.workers = int(workers if workers is not None else spec.get("workers", 1))
+        self.layout_cache_size = int(spec.get("layout_cache_size", 4))
+        self.artifact_store = None
+        if spec.get("artifact_store"):
+            self.artifact_store = FileArtifactStore(
+                self.project_root / "experiments" / "output" / "_artifacts"
+            )
+        self.runners = [self._build_runner(set_spec) for set_spec in spec["sets"]]
+
+    @classmethod
+    def from_file(
+            cls,
+            path: str | Path,
+            project_root: Path,
+            workers: int | None = None,
+    ) -> Campaign:
+        return cls(load_campaign_spec(path), project_root, workers=workers)
+
+    def _resolve(self, path: str) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else self.project_root / path
+
+    def _build_runner(self, set_spec: dict) -> PipelineRunner:
+        kwargs = {**self.spec.get("defaults", {}), **set_spec}
+        runner_kwargs = {key: value for key, value in kwargs.items() if key not in _SET_KEYS}
+        runner_kwargs["instance_workers"] = min(
+            int(runner_kwargs.get("instance_workers", self.workers)), self.workers
+        )
+        runner_kwargs.setdefault("artifact_store", self.artifact_store)
+
+        return GlobRunner(
+            set_spec["name"],
+            self._resolve(set_spec["instances_dir"]),
+            self.project_root,
+            data_card=load_and_flatten_data_card(self._resolve(set_spec["data_card"])),
+            loader_cls=get_loader_cls(set_spec["loader"]),
+            pattern=kwargs.get("pattern", "*.txt"),
+            **runner_kwargs,
+        )
+
+    def run(self) -> dict:
+        """Run all sets and write the consolidated runtime report."""
+        t0 = time.perf_counter()
+        jobs = []
+        for runner in self.runners:
+            instances = runner.discover_instances()
+            if runner.shard is not None:
+                instances = runner.shard_instances(instances)
+            if runner.resume:
+                instances = runner.pending_instances(instances)
+            print(f"{runner.instance_set_name}: {len(instances)} instances")
+            jobs.extend(
+                (runner, instance_name, file_paths, runner.instance_layout_key(file_paths))
+                for instance_name, file_paths in instances
+            )
+
+        print(f"\nRunning {len(jobs)} instances of {len(self.runners)} sets "
+              f"on {self.workers} worker(s)...\n")
+        with WarmWorkerPool(self.workers, self.layout_cache_size) as pool:
+            for runner, instance_name, timings in pool.run(jobs):
+                if timings is not None:
+                    runner.pipeline_runtimes[instance_name] = timings
+
+        for runner in self.runners:
+            runner.save_runtimes()
+        return self.save_report(time.perf_counter() - t0)
+
+    def save_report(self, wall_time: float) -> dict:
+        report = {"campaign": self.name, "wall_time": wall_time, "sets": {}}
+        for runner in self.runners:
+            totals = [timings.get("total", 0.0) for timings in runner.pipeline_runtimes.values()]
+            report["sets"][runner.instance_set_name] = {
+                "n_instances": len(totals),
+                "total_time": sum(totals),
+                "instances": runner.pipeline_runtimes,
+            }
+
+        output_folder = self.project_root / "experiments" / "output" / "runtimes"
+        output_folder.mkdir(parents=True, exist_ok=True)
+        path = output_folder / f"campaign_{self.name}.json"
+        with file_lock(f"{path}.lock"):
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            dump_json(tmp_path, report, indent=2)
+            os.replace(tmp_path, path)
+        return report
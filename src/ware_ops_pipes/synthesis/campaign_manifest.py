@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from ware_ops_pipes.pipelines.io_helpers import file_lock
+
+
+class CampaignManifest:
+    """Append-only JSONL record of the finished work of one instance set.
+
+    Two kinds of lines are written::
+
+        {"instance": "i1", "pipeline": "<task_id>", "status": "ok", "path": ".../summary.json"}
+        {"instance": "i1", "complete": true, "n_pipelines": 42, "synthesis_key": "<key>"}
+
+    A pipeline is finished once its summary exists or it ended with a
+    terminal record (``timeout``, ``oom``, ``dominated``). An instance is
+    complete once all of its pipelines are finished, for the portfolio given
+    by the synthesis key; other components or filters make it incomplete
+    again. Several runner processes
+    may append to the same manifest; appends are serialized by a file lock.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._pipelines: dict[str, dict[str, dict]] = {}
+        self._complete: dict[str, str | None] = {}
+        self.reload()
+
+    def reload(self) -> None:
+        self._pipelines.clear()
+        self._complete.clear()
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crashed writer.
+                    continue
+                self._apply(entry)
+
+    def is_complete(self, instance_name: str, synthesis_key: str | None) -> bool:
+        return (
+            instance_name in self._complete
+            and self._complete[instance_name] == synthesis_key
+        )
+
+    def finished_pipelines(self, instance_name: str) -> dict[str, dict]:
+        return self._pipelines.get(instance_name, {})
+
+    def is_finished(self, instance_name: str, pipeline_id: str) -> bool:
+        return pipeline_id in self._pipelines.get(instance_name, {})
+
+    def record_pipelines(self, instance_name: str, records: list[dict]) -> None:
+        """Append ``{"pipeline", "status", "path"}`` records of one instance."""
+        self._append([{"instance": instance_name, **record} for record in records])
+
+    def record_instance_complete(
+            self,
+            instance_name: str,
+            n_pipelines: int,
+            synthesis_key: str | None,
+    ) -> None:
+        self._append([{
+            "instance": instance_name,
+            "complete": True,
+            "n_pipelines": n_pipelines,
+            "synthesis_key": synthesis_key,
+        }])
+
+    def _apply(self, entry: dict) -> None:
+        instance_name = entry["instance"]
+        if entry.get("complete"):
+            self._complete[instance_name] = entry.get("synthesis_key")
+        else:
+            self._pipelines.setdefault(instance_name, {})[entry["pipeline"]] = entry
+
+    def _append(self, entries: list[dict]) -> None:
+        if not entries:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(f"{self.path}.lock"):
+            with open(self.path, "a") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+
+        for entry in entries:
+            self._apply(entry)
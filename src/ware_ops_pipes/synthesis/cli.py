@@ -0,0 +1,92 @@
+"""Command line flags shared by the experiment scripts.
+
+``experiments/run_*.py`` only differ in their instance sets, data cards and
+loaders; the execution and storage options of ``PipelineRunner`` are added
+to their parsers here and mapped back onto runner keywords, so a new runner
+option gets its flag in one place.
+"""
+import argparse
+import pickle
+from pathlib import Path
+
+from ware_ops_pipes.pipelines.artifact_store import FileArtifactStore
+from ware_ops_pipes.synthesis.runner import parse_shard
+
+
+def add_runner_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Add the flags of the ``PipelineRunner`` options to ``parser``."""
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of Luigi workers (parallel pipelines).")
+    parser.add_argument("--instance-workers", type=int, default=1,
+                        help="Number of processes running instances in parallel.")
+    parser.add_argument("--shard", type=parse_shard, default=None,
+                        help="Process only shard i of n of the instances, given as 'i/n'.")
+    parser.add_argument("--central-scheduler", action="store_true",
+                        help="Use a luigid central scheduler instead of a local one.")
+    parser.add_argument("--scheduler-port", type=int, default=8082,
+                        help="Port of the luigid central scheduler on localhost.")
+    parser.add_argument("--task-timeout", type=int, default=None,
+                        help="Hard wall-clock limit per task in seconds.")
+    parser.add_argument("--task-memory-limit", type=int, default=None,
+                        help="Hard resident memory limit per task in MB.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip instances and pipelines recorded as finished in the campaign manifest.")
+    parser.add_argument("--warm-pool", action="store_true",
+                        help="Keep instance workers alive and route instances to the worker holding their layout.")
+    parser.add_argument("--artifact-store", action="store_true",
+                        help="Store pickled task outputs content-addressed under experiments/output/_artifacts.")
+    parser.add_argument("--memoize", action="store_true",
+                        help="Reuse stage outputs for byte-identical stage inputs.")
+    parser.add_argument("--layout-format", choices=["pickle", "npy"], default="pickle",
+                        help="Storage format of cached layouts; npy memory-maps the matrices.")
+    parser.add_argument("--pickle-protocol", type=int, default=pickle.DEFAULT_PROTOCOL,
+                        help="Pickle protocol of task outputs; 5 writes NumPy buffers out of band.")
+    parser.add_argument("--pickle-codec", default="none",
+                        help="Compression of pickled task outputs: none, gzip, lzma or zstd.")
+    parser.add_argument("--compact-json", action="store_true",
+                        help="Write pipeline summaries without indentation.")
+    parser.add_argument("--results-store", action="store_true",
+                        help="Also write results into experiments/output/results.sqlite and rank from it.")
+    parser.add_argument("--output-layout", choices=["flat", "sharded"], default="flat",
+                        help="Directory layout of task outputs; sharded adds a manifest per instance.")
+    parser.add_argument("--retention", choices=["keep-all", "keep-summaries", "keep-best-k"],
+                        default="keep-all",
+                        help="Intermediate task outputs to keep after ranking an instance.")
+    parser.add_argument("--retention-k", type=int, default=1,
+                        help="Number of best pipelines whose intermediates keep-best-k keeps.")
+    parser.add_argument("--archive-intermediates", action="store_true",
+                        help="Pack discarded intermediates into one archive per instance instead of deleting them.")
+    parser.add_argument("--data-cache-max-mb", type=int, default=None,
+                        help="Evict least recently used layouts and memoized outputs beyond this size.")
+    return parser
+
+
+def runner_kwargs(args: argparse.Namespace, project_root: Path) -> dict:
+    """``PipelineRunner`` keywords of the flags added by ``add_runner_arguments``."""
+    artifact_store = None
+    if args.artifact_store:
+        artifact_store = FileArtifactStore(Path(project_root) / "experiments" / "output" / "_artifacts")
+
+    return {
+        "workers": args.workers,
+        "instance_workers": args.instance_workers,
+        "shard": args.shard,
+        "central_scheduler": args.central_scheduler,
+        "scheduler_port": args.scheduler_port,
+        "task_timeout_sec": args.task_timeout,
+        "task_memory_limit_mb": args.task_memory_limit,
+        "resume": args.resume,
+        "warm_pool": args.warm_pool,
+        "artifact_store": artifact_store,
+        "memoize": args.memoize,
+        "layout_format": args.layout_format,
+        "pickle_protocol": args.pickle_protocol,
+        "pickle_codec": args.pickle_codec,
+        "compact_json": args.compact_json,
+        "results_store": args.results_store,
+        "output_layout": args.output_layout,
+        "retention": args.retention,
+        "retention_k": args.retention_k,
+        "archive_intermediates": args.archive_intermediates,
+        "data_cache_max_mb": args.data_cache_max_mb,
+    }
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from os.path import join as pjoin
+
 from luigi.task import flatten
 
 from ware_ops_pipes.pipelines.io_helpers import load_pickle
@@ -14,6 +16,11 @@ _SOL_KEY_TO_STAGE = {
 }
 
 
+def pipeline_record_path(task) -> str:
+    """Terminal record of the pipeline ending in result aggregation ``task``."""
+    return pjoin(task.pipeline_params.output_folder, f"{task._base_task_id}_terminal.json")
+
+
 def collect_from_graph(task) -> dict[str, dict]:
     """Walk the task DAG depth-first and collect solutions + provenance.
 
@@ -137,3 +144,27 @@ def collect_provenance(task) -> list[dict]:
 def provenance_by_stage(provenance: list[dict]) -> dict[str, dict]:
     """Index provenance list by stage name for easy lookup."""
     return {entry["stage"]: entry for entry in provenance}
+
+
+def stage_algos(task) -> dict[str, str]:
+    """Algorithm of every stage of a pipeline, also if it did not finish.
+
+    Stages with a solution report its algorithm, as in a summary; stages
+    without one report the class of their task.
+    """
+    algos = {stage: entry["algo"] for stage, entry in collect_from_graph(task).items()}
+
+    stack, seen = [task], set()
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        stack.extend(flatten(current.requires()))
+
+        outputs = current.output()
+        for sol_key, stage_name in _SOL_KEY_TO_STAGE.items():
+            if sol_key in outputs:
+                algos.setdefault(stage_name, type(current).__name__)
+                break
+    return algos
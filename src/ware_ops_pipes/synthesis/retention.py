@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import tarfile
+from pathlib import Path
+
+import luigi
+import pandas as pd
+from luigi.task import flatten
+
+from ware_ops_pipes.pipelines.io_helpers import load_json
+from ware_ops_pipes.pipelines.results_store import pipeline_id
+from ware_ops_pipes.pipelines.target_manifest import MANIFEST_FILE, get_manifest
+
+RETENTION_POLICIES = ("keep-all", "keep-summaries", "keep-best-k")
+ARCHIVE_FILE = "intermediates.tar"
+
+
+def dag_tasks(pipeline: luigi.Task) -> list[luigi.Task]:
+    """All tasks of a pipeline, the pipeline itself included."""
+    tasks, stack, seen = [], [pipeline], set()
+    while stack:
+        task = stack.pop()
+        if id(task) in seen:
+            continue
+        seen.add(id(task))
+        tasks.append(task)
+        stack.extend(flatten(task.requires()))
+    return tasks
+
+
+def best_pipelines(
+        pipelines: list[luigi.Task],
+        ranking: pd.DataFrame | None,
+        k: int,
+) -> list[luigi.Task]:
+    """The ``k`` finished pipelines ranked best, in ranking order."""
+    if ranking is None or ranking.empty or k <= 0:
+        return []
+
+    ok = ranking[ranking["status"] == "ok"]
+    ranks: dict[str, int] = {}
+    for rank, pid in enumerate(ok["pipeline_id"]):
+        ranks.setdefault(pid, rank)
+
+    ranked = []
+    for pipeline in pipelines:
+        summary_path = pipeline.output()["summary"].path
+        if not os.path.exists(summary_path):
+            continue
+        pid = pipeline_id(load_json(summary_path))
+        if pid in ranks:
+            ranked.append((ranks[pid], pipeline))
+
+    ranked.sort(key=lambda item: item[0])
+    return [pipeline for _, pipeline in ranked[:k]]
+
+
+def compact_instance(
+        output_folder: Path,
+        pipelines: list[luigi.Task],
+        keep: list[luigi.Task],
+        archive: bool = False,
+) -> tuple[int, int]:
+    """Remove the intermediate targets of all pipelines not in ``keep``.
+
+    Summaries are always kept, as are the targets of the kept pipelines and
+    everything outside ``output_folder`` (shared layouts). With ``archive``
+    the removed files are first added to ``intermediates.tar`` in the
+    instance folder. Returns the number and total size of removed files.
+    """
+    output_folder = Path(output_folder)
+    root = str(output_folder.resolve())
+
+    kept = {pipeline.output()["summary"].path for pipeline in pipelines}
+    for pipeline in keep:
+        for task in dag_tasks(pipeline):
+            kept.update(target.path for target in flatten(task.output()))
+
+    discarded = {}
+    for pipeline in pipelines:
+        for task in dag_tasks(pipeline):
+            for target in flatten(task.output()):
+                path = target.path
+                if path in kept or path in discarded:
+                    continue
+                if not os.path.realpath(path).startswith(root + os.sep):
+                    continue
+                if os.path.exists(path):
+                    discarded[path] = os.path.getsize(path)
+
+    if not discarded:
+        return 0, 0
+
+    if archive:
+        archive_files(output_folder / ARCHIVE_FILE, output_folder, list(discarded))
+
+    for path in discarded:
+        os.remove(path)
+
+    # Deleted targets must no longer count as complete.
+    if (output_folder / MANIFEST_FILE).exists():
+        get_manifest(str(output_folder)).discard(list(discarded))
+
+    return len(discarded), sum(discarded.values())
+
+
+def archive_files(archive_path: Path, base_dir: Path, paths: list[str]) -> None:
+    """Add ``paths`` to the tar at ``archive_path``, named relative to ``base_dir``.
+
+    Members of an existing archive are carried over unless a file of the
+    same name is added again, e.g. by a rerun of the instance, so every
+    name is archived once, with its latest content. The archive is written
+    next to the old one and renamed into place.
+    """
+    names = {os.path.relpath(path, base_dir): path for path in paths}
+
+    tmp = f"{archive_path}.tmp.{os.getpid()}"
+    with tarfile.open(tmp, "w") as tar:
+        if os.path.exists(archive_path):
+            with tarfile.open(archive_path) as old:
+                # Archives appended to by earlier versions may hold a name
+                # more than once; the last member is the current one.
+                members = {member.name: member for member in old.getmembers()}
+                for name, member in members.items():
+                    if name in names:
+                        continue
+                    tar.addfile(member, old.extractfile(member) if member.isfile() else None)
+        for name, path in names.items():
+            tar.add(path, arcname=name)
+    os.replace(tmp, archive_path)
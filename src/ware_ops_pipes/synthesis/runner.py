@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import math
+import os
+import pickle
 import time
 from abc import abstractmethod, ABC
-from typing import Tuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Iterator, Tuple
 from pathlib import Path
 
 import luigi
-from cls.fcl import FiniteCombinatoryLogic
-from cls.subtypes import Subtypes
+import pandas as pd
+from luigi.task import flatten
 from cls_luigi.inhabitation_task import RepoMeta
 from cls_luigi.unique_task_pipeline_validator import UniqueTaskPipelineValidator
 from ware_ops_pipes.data_loaders import DataLoader
@@ -20,9 +27,71 @@ from ware_ops_pipes.pipelines.subproblems.batching.generated.index import (
     CONFIGURED_COMPONENT_MODULES,
 )
 
+from ware_ops_pipes.pipelines.artifact_store import ArtifactStore
+from ware_ops_pipes.pipelines.data_cache import evict_data_cache, leased
+from ware_ops_pipes.pipelines.io_helpers import dump_json, file_lock, load_json
+from ware_ops_pipes.pipelines.layout_cache import layout_cache_enabled, layout_key, load_layout
+from ware_ops_pipes.pipelines.pipeline_params import loader_name_from_cls
+from ware_ops_pipes.pipelines.results_store import (
+    RESULTS_DB_FILE,
+    discard_result,
+    get_results_store,
+    pipeline_id,
+    record_result,
+)
+from ware_ops_pipes.pipelines.target_manifest import summary_paths
+from ware_ops_pipes.synthesis.retention import (
+    RETENTION_POLICIES,
+    best_pipelines,
+    compact_instance,
+    dag_tasks,
+)
+from ware_ops_pipes.pipelines.racing import dominated_record_path, reset_incumbent
+from ware_ops_pipes.pipelines.supervision import clear_limit_record, limit_record_path
+from ware_ops_pipes.synthesis.pipeline_provenance import pipeline_record_path, stage_algos
+from ware_ops_pipes.synthesis.campaign_manifest import CampaignManifest
+from ware_ops_pipes.synthesis.warm_pool import WarmWorkerPool
 from ware_ops_pipes.ranking.ranking import RankingEvaluator
 from ware_ops_pipes.pipelines import set_pipeline_params, inhabit, print_tree
 
+# Gurobi reads parameters from a gurobi.env in the working directory whenever
+# it creates an environment. Runners write one to cap the solver threads; a
+# file without this header belongs to the user and is left alone.
+GUROBI_ENV_FILE = "gurobi.env"
+_GUROBI_ENV_HEADER = "# Written by ware_ops_pipes: solver threads per worker\n"
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse a ``"i/n"`` shard specification with ``0 <= i < n``."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must have the form 'i/n', got {spec!r}") from None
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must satisfy 0 <= i < n, got {spec!r}")
+
+    return index, count
+
+
+# Runner held by each process of the instance pool. Every worker process owns
+# its own PipelineParams config and Luigi instance cache, so instances running
+# in different workers never see each other's parameters.
+_WORKER_RUNNER: PipelineRunner | None = None
+
+
+def _init_instance_worker(runner: PipelineRunner) -> None:
+    global _WORKER_RUNNER
+    _WORKER_RUNNER = runner
+
+
+def _run_instance_in_worker(
+        instance_name: str,
+        file_paths: list[Path],
+) -> tuple[str, dict | None]:
+    return instance_name, _WORKER_RUNNER._run_instance_safe(instance_name, file_paths)
+
+
 class PipelineRunner(ABC):
     """Base class for running pipelines on warehouse instances"""
 
@@ -41,6 +110,34 @@ class PipelineRunner(ABC):
             loader_kwargs: dict | None = None,
             loader_cls=None,
             workers: int = 1,
+            instance_workers: int = 1,
+            cache_synthesis: bool = True,
+            stream_chunk_size: int | None = None,
+            shard: str | tuple[int, int] | None = None,
+            central_scheduler: bool = False,
+            scheduler_host: str = "localhost",
+            scheduler_port: int = 8082,
+            resource_limits: dict[str, int] | None = None,
+            task_timeout_sec: int | None = None,
+            task_memory_limit_mb: int | None = None,
+            racing: bool = False,
+            racing_tolerance: float = 0.0,
+            resume: bool = False,
+            warm_pool: bool = False,
+            layout_cache_size: int = 4,
+            artifact_store: ArtifactStore | None = None,
+            memoize: bool = False,
+            layout_format: str = "pickle",
+            pickle_protocol: int = pickle.DEFAULT_PROTOCOL,
+            pickle_codec: str = "none",
+            pickle_codecs: dict[str, str] | None = None,
+            compact_json: bool = False,
+            results_store: bool = False,
+            output_layout: str = "flat",
+            retention: str = "keep-all",
+            retention_k: int = 1,
+            archive_intermediates: bool = False,
+            data_cache_max_mb: int | None = None,
     ):
         self.instance_set_name = instance_set_name
         self.instances_dir = Path(instances_dir)
@@ -52,8 +149,56 @@ class PipelineRunner(ABC):
         self.verbose = verbose
         self.pipeline_runtimes = {}
         self.time_limit_sec = time_limit_sec
+        # Hard limits enforced on every task by running it in a supervised
+        # child process, unlike time_limit_sec which algorithms may ignore.
+        self.task_timeout_sec = task_timeout_sec
+        self.task_memory_limit_mb = task_memory_limit_mb
         self.gen_tour = gen_tour
         self.workers = workers
+        self.instance_workers = max(1, instance_workers)
+        # With warm_pool=True, instance workers are long-lived, keep up to
+        # layout_cache_size deserialized layouts resident and receive the
+        # instances of the layouts they already hold.
+        self.warm_pool = warm_pool
+        self.layout_cache_size = layout_cache_size
+        # Content-addressed store for pickled task outputs; targets then hold
+        # small pointer files and identical artifacts are written once.
+        self.artifact_store = artifact_store
+        # Reuse the outputs of a stage for byte-identical inputs, also across
+        # instances and runs (see pipelines.memoization).
+        self.memoize = memoize
+        # "npy" stores the layout matrices as memory-mapped .npy files that
+        # all processes of a host share (see layout_cache.dump_layout).
+        self.layout_format = layout_format
+        # Serialization of task outputs: protocol 5 writes NumPy buffers out
+        # of band, codecs ("gzip", "lzma", "zstd") trade CPU for I/O and may
+        # be chosen per artifact name, e.g. {"routing_sol": "lzma"}.
+        self.pickle_protocol = pickle_protocol
+        self.pickle_codec = pickle_codec
+        self.pickle_codecs = pickle_codecs or {}
+        self.compact_json = compact_json
+        # Result aggregation also writes into one SQLite results store, which
+        # ranking then queries instead of globbing the summary files.
+        self.results_db = (
+            self.project_root / "experiments" / "output" / RESULTS_DB_FILE
+            if results_store else None
+        )
+        # "sharded" spreads the targets of an instance over
+        # <stage>/<hash prefix>/ directories and lists them in a manifest,
+        # which completion checks and ranking read instead of the directory.
+        self.output_layout = output_layout
+        # Intermediate task outputs to keep once an instance is ranked:
+        # "keep-all", "keep-summaries" or "keep-best-k" (the retention_k best
+        # pipelines). The others are deleted or, with archive_intermediates,
+        # packed into one archive per instance (see synthesis.retention).
+        if retention not in RETENTION_POLICIES:
+            raise ValueError(f"Unknown retention policy: {retention!r}")
+        self.retention = retention
+        self.retention_k = retention_k
+        self.archive_intermediates = archive_intermediates
+        # Size cap of the shared _data_cache (layouts, memoized outputs).
+        # Least recently used entries are evicted after every instance.
+        self.data_cache_max_mb = data_cache_max_mb
 
         # Component implementations
         self.implementation_module = {
@@ -87,6 +232,48 @@ class PipelineRunner(ABC):
         self.loader: DataLoader | None = None
         self.ranker = ranker
 
+        # Synthesis depends only on the data card, the exclusions and the
+        # component repository, so its results are reused for every instance
+        # of a campaign. Luigi resolves all targets through PipelineParams at
+        # call time, which lets cached pipelines rebind to the next instance.
+        self.cache_synthesis = cache_synthesis
+        self._applicable_cache: dict[str, tuple[list, list]] = {}
+        self._pipeline_cache: dict[str, list] = {}
+
+        # When set, enumerated pipelines are handed to Luigi in chunks of
+        # this size, so execution starts before enumeration has finished.
+        self.stream_chunk_size = stream_chunk_size
+
+        # Sharding splits the discovered instances deterministically across
+        # runner processes or hosts. With a central scheduler (``luigid``)
+        # the processes share task deduplication, which is why task ids
+        # are then scoped to the instance or, for layouts, to the layout.
+        self.shard = parse_shard(shard) if isinstance(shard, str) else shard
+        self.central_scheduler = central_scheduler
+        self.scheduler_host = scheduler_host
+        self.scheduler_port = scheduler_port
+
+        # Maximum number of concurrently running tasks per resource class
+        # (see BaseComponent.resource_class). Heuristic pipelines claim no
+        # resource and keep the remaining Luigi workers busy.
+        self.resource_limits = {"exclusive_solver": 1, **(resource_limits or {})}
+
+        # Racing mode runs cheap pipelines first and aborts routing tasks
+        # whose running distance cannot beat the best finished pipeline of
+        # the instance. Component costs are learned from earlier instances.
+        self.racing = racing
+        self.racing_tolerance = racing_tolerance
+        self._component_costs: dict[str, tuple[float, int]] = {}
+
+        # Finished pipelines are always recorded in the campaign manifest.
+        # With resume=True, complete instances are skipped outright and only
+        # the unfinished pipelines of partial instances are scheduled.
+        self.resume = resume
+        self.manifest = CampaignManifest(
+            self.project_root / "experiments" / "output" / "manifests"
+            / f"{self.instance_set_name}.jsonl"
+        )
+
     @abstractmethod
     def discover_instances(self) -> list[Tuple[str, list[Path]]]:
         """
@@ -99,43 +286,145 @@ class PipelineRunner(ABC):
         Run pipelines for all discovered instances
         """
         instances = self.discover_instances()
+        n_discovered = len(instances)
+        if self.shard is not None:
+            instances = self.shard_instances(instances)
 
         print(f"\n{'=' * 80}")
         print(f"Instance Set: {self.instance_set_name}")
-        print(f"Found {len(instances)} instances")
+        print(f"Found {n_discovered} instances")
+        if self.shard is not None:
+            print(f"Shard {self.shard[0]}/{self.shard[1]}: {len(instances)} instances")
+        if self.resume:
+            n_before = len(instances)
+            instances = self.pending_instances(instances)
+            print(f"Resume: skipping {n_before - len(instances)} complete instances")
         print(f"{'=' * 80}\n")
-        for instance_name, file_paths in instances:
-            try:
-                self.run_instance(instance_name, file_paths)
-            except Exception as e:
-                print(f"Error processing {instance_name}: {e}")
-                if self.verbose:
-                    import traceback
-                    traceback.print_exc()
+        if self.warm_pool and self.instance_workers > 1 and len(instances) > 1:
+            with WarmWorkerPool(self.instance_workers, self.layout_cache_size) as pool:
+                self.run_in_pool(pool, instances)
+        elif self.instance_workers > 1 and len(instances) > 1:
+            self._run_instances_parallel(instances)
+        else:
+            for instance_name, file_paths in instances:
+                self._run_instance_safe(instance_name, file_paths)
         self.save_runtimes()
 
-    def run_instance(self, instance_name: str, file_paths: list[Path]):
-        """Run pipelines for a single instance"""
+    def shard_instances(
+            self,
+            instances: list[Tuple[str, list[Path]]],
+    ) -> list[Tuple[str, list[Path]]]:
+        """Select this runner's shard of the discovered instances.
 
-        print(f"\n{'=' * 80}")
-        print(f"Processing: {instance_name}")
-        print(f"{'=' * 80}\n")
-        timings = {}
-        t0 = time.perf_counter()
-        timings["load_domain"] = time.perf_counter() - t0
+        Instances are sorted by name before striding, so every process that
+        discovers the same directory gets the same partition regardless of
+        file system ordering.
+        """
+        index, count = self.shard
+        ordered = sorted(instances, key=lambda instance: instance[0])
+        return ordered[index::count]
+
+    def _run_instances_parallel(self, instances: list[Tuple[str, list[Path]]]):
+        """Spread whole instances across a process pool.
+
+        Each worker runs ``run_instance`` for one instance at a time, so the
+        Luigi ``workers`` setting still applies inside every instance. The
+        per-instance timings are returned to the parent and merged into
+        ``pipeline_runtimes``.
+        """
+        n_processes = min(self.instance_workers, len(instances))
+        print(f"Running instances in {n_processes} process(es)...\n")
+
+        with ProcessPoolExecutor(
+                max_workers=n_processes,
+                initializer=_init_instance_worker,
+                initargs=(self,),
+        ) as executor:
+            futures = [
+                executor.submit(_run_instance_in_worker, instance_name, file_paths)
+                for instance_name, file_paths in instances
+            ]
+            for future in as_completed(futures):
+                try:
+                    instance_name, timings = future.result()
+                except Exception as e:
+                    print(f"Instance worker failed: {e}")
+                    continue
+                if timings is not None:
+                    self.pipeline_runtimes[instance_name] = timings
+
+    def run_in_pool(
+            self,
+            pool: WarmWorkerPool,
+            instances: list[Tuple[str, list[Path]]],
+    ) -> None:
+        """Run instances on a warm worker pool, routed by their layout key."""
+        print(f"Running instances on {pool.n_workers} warm worker(s)...\n")
+        jobs = [
+            (self, instance_name, file_paths, self.instance_layout_key(file_paths))
+            for instance_name, file_paths in instances
+        ]
+        for _, instance_name, timings in pool.run(jobs):
+            if timings is not None:
+                self.pipeline_runtimes[instance_name] = timings
+
+    def instance_layout_key(self, file_paths: list[Path]) -> str | None:
+        """Layout key of an instance as computed by ``LayoutLoader``, or None."""
+        try:
+            loader = self.loader_cls(instances_dir=self.instances_dir, **self.loader_kwargs)
+            return layout_key(
+                loader_name_from_cls(self.loader_cls),
+                json.loads(json.dumps(self.loader_kwargs, sort_keys=True)),
+                loader.instance_layout_signature(Path(file_paths[0])),
+            )
+        except Exception as e:
+            print(f"Could not compute layout key of {file_paths[0]}: {e}")
+            return None
+
+    @staticmethod
+    def _layout_path() -> str:
+        """Path of the cached layout of the current instance."""
+        from ware_ops_pipes.pipelines.templates.template_1 import LayoutLoader
+
+        return LayoutLoader().output()["layout"].path
+
+    def _prewarm_layout(self) -> None:
+        """Load the cached layout into this process before Luigi forks.
+
+        With more than one Luigi worker every task runs in a forked process,
+        which then inherits the resident layout instead of unpickling it.
+        """
+        path = self._layout_path()
+        if os.path.exists(path):
+            load_layout(path)
+
+    def _run_instance_safe(self, instance_name: str, file_paths: list[Path]) -> dict | None:
+        """Run one instance and report errors instead of raising them."""
+        try:
+            return self.run_instance(instance_name, file_paths)
+        except Exception as e:
+            print(f"Error processing {instance_name}: {e}")
+            if self.verbose:
+                import traceback
+                traceback.print_exc()
+        return None
+
+    def _applicable_algos(self) -> tuple[list, list]:
+        """Algorithms applicable to the data card, and those of them imported.
+
+        The second list leaves out the excluded algorithms.
+        """
+        card_key = self._card_key()
+        cached_algos = self._applicable_cache.get(card_key) if self.cache_synthesis else None
+        if cached_algos is not None:
+            return cached_algos
 
-        # Filter applicable algorithms
-        t0 = time.perf_counter()
         domain_algo_mapper = DomainAlgorithmMapper(TAXONOMY)
         algos_applicable = domain_algo_mapper.filter(
             algorithms=self.algos,
             instance=self.data_card,
             verbose=self.verbose
         )
-        timings["filter_and_import"] = time.perf_counter() - t0
-
-        if self.verbose:
-            print(f"{len(algos_applicable)}/{len(self.algos)} algorithms applicable")
 
         # Import applicable models
         final_algos = []
@@ -144,6 +433,52 @@ class PipelineRunner(ABC):
                 final_algos.append(m)
 
         self._import_models(final_algos)
+        if self.cache_synthesis:
+            self._applicable_cache[card_key] = (algos_applicable, final_algos)
+        return algos_applicable, final_algos
+
+    def portfolio_key(self) -> str | None:
+        """Synthesis key of the pipelines this runner builds.
+
+        None if no algorithm is applicable. Instances are recorded complete
+        under this key, so a changed portfolio runs them again on resume.
+        """
+        algos_applicable, final_algos = self._applicable_algos()
+        if not algos_applicable:
+            return None
+        with self._scoped_repository(final_algos):
+            return self._synthesis_key(self._card_key())
+
+    def pending_instances(
+            self,
+            instances: list[Tuple[str, list[Path]]],
+    ) -> list[Tuple[str, list[Path]]]:
+        """Instances not recorded complete for the current portfolio."""
+        key = self.portfolio_key()
+        return [
+            (instance_name, file_paths)
+            for instance_name, file_paths in instances
+            if not self.manifest.is_complete(instance_name, key)
+        ]
+
+    def run_instance(self, instance_name: str, file_paths: list[Path]) -> dict | None:
+        """Run pipelines for a single instance and return its timings"""
+
+        print(f"\n{'=' * 80}")
+        print(f"Processing: {instance_name}")
+        print(f"{'=' * 80}\n")
+        timings = {}
+        t0 = time.perf_counter()
+        timings["load_domain"] = time.perf_counter() - t0
+
+        # Filter applicable algorithms
+        t0 = time.perf_counter()
+        card_key = self._card_key()
+        algos_applicable, final_algos = self._applicable_algos()
+        timings["filter_and_import"] = time.perf_counter() - t0
+
+        if self.verbose:
+            print(f"{len(algos_applicable)}/{len(self.algos)} algorithms applicable")
 
         # Setup output folder
         output_folder = (
@@ -152,6 +487,8 @@ class PipelineRunner(ABC):
         )
         output_folder.mkdir(parents=True, exist_ok=True)
 
+        racing = self._racing_enabled()
+
         set_pipeline_params(
             output_folder=str(output_folder),
             data_cache_folder=str(
@@ -165,33 +502,379 @@ class PipelineRunner(ABC):
             loader_kwargs=self.loader_kwargs,
             time_limit_seconds=self.time_limit_sec,
             gen_tour=self.gen_tour,
+            scope_task_ids=self.central_scheduler,
+            task_timeout_seconds=self.task_timeout_sec,
+            task_memory_limit_mb=self.task_memory_limit_mb,
+            racing=racing,
+            racing_tolerance=self.racing_tolerance,
+            artifact_store=self.artifact_store,
+            memoize=self.memoize,
+            layout_format=self.layout_format,
+            pickle_protocol=self.pickle_protocol,
+            pickle_codec=self.pickle_codec,
+            pickle_codecs=self.pickle_codecs,
+            compact_json=self.compact_json,
+            results_db=str(self.results_db) if self.results_db else None,
+            output_layout=self.output_layout,
         )
 
-        # Build and run pipelines
-        t0 = time.perf_counter()
-        pipelines = None
-        if len(algos_applicable) > 0:
-            pipelines = self._build_pipelines()
-        timings["build_pipelines"] = time.perf_counter() - t0
+        if self.workers > 1 and layout_cache_enabled():
+            self._prewarm_layout()
+
+        # Build and run pipelines. The lease keeps other runner processes
+        # from evicting the layout while tasks of this instance read it.
+        layout_path = self._layout_path()
+        os.makedirs(os.path.dirname(layout_path), exist_ok=True)
+        with self._scoped_repository(final_algos), leased(layout_path):
+            t0 = time.perf_counter()
+            pipelines = None
+            pipeline_stream = None
+            synthesis_key = None
+            if len(algos_applicable) > 0:
+                synthesis_key = self._synthesis_key(card_key)
+                pipelines = self._pipeline_cache.get(synthesis_key) if self.cache_synthesis else None
+                if pipelines is not None:
+                    if self.verbose:
+                        print(f"Reusing {len(pipelines)} synthesized pipelines")
+                elif self.stream_chunk_size:
+                    pipeline_stream = self.iter_pipelines()
+                else:
+                    pipelines = self._build_pipelines()
+                    if self.cache_synthesis:
+                        self._pipeline_cache[synthesis_key] = pipelines
+            timings["build_pipelines"] = time.perf_counter() - t0
+
+            if racing and (pipelines or pipeline_stream is not None):
+                self._seed_incumbent(output_folder)
+                if pipelines:
+                    pipelines = self._order_by_predicted_cost(pipelines)
+
+            t0 = time.perf_counter()
+            if pipeline_stream is not None:
+                pipelines, t_enumerate = self._run_pipeline_stream(instance_name, pipeline_stream)
+                if self.cache_synthesis:
+                    self._pipeline_cache[synthesis_key] = pipelines
+                timings["build_pipelines"] += t_enumerate
+                t0 += t_enumerate
+            elif pipelines:
+                print(f"\nRunning {len(pipelines)} pipelines with {self.workers} worker(s)...\n")
+                self._execute_pipelines(instance_name, pipelines)
 
-        t0 = time.perf_counter()
         if pipelines:
-            print(f"\nRunning {len(pipelines)} pipelines with {self.workers} worker(s)...\n")
-            luigi.interface.InterfaceLogging.setup(type('opts',
-                                                        (),
-                                                        {'background': None,
-                                                         'logdir': None,
-                                                         'logging_conf_file': None,
-                                                         'log_level': 'DEBUG' if self.verbose else 'WARNING'
-                                                         }))
-            luigi.build(pipelines, local_scheduler=True, workers=self.workers)
+            finished = self.manifest.finished_pipelines(instance_name)
+            if all(pipeline._base_task_id in finished for pipeline in pipelines):
+                self.manifest.record_instance_complete(instance_name, len(pipelines), synthesis_key)
 
-            self.create_ranking(instance_name, output_folder)
+            ranking = self.create_ranking(instance_name, output_folder)
+            if racing:
+                self._learn_component_costs(output_folder)
+            if self.retention != "keep-all":
+                self._compact(output_folder, pipelines, ranking)
+            if self.data_cache_max_mb is not None:
+                self._evict_data_cache()
             timings["run_pipelines"] = time.perf_counter() - t0
             timings["total"] = sum(timings.values())
             self.pipeline_runtimes[instance_name] = timings
+            return timings
         else:
             print("No valid pipelines found.")
+            return None
+
+    def _execute_pipelines(self, instance_name: str, pipelines: list[luigi.Task]) -> None:
+        """Hand a batch of pipelines to Luigi and record the finished ones."""
+        if self.resume:
+            pipelines = [
+                pipeline for pipeline in pipelines
+                if not self.manifest.is_finished(instance_name, pipeline._base_task_id)
+            ]
+            if not pipelines:
+                return
+
+        config = luigi.configuration.get_config()
+        for resource_class, limit in self.resource_limits.items():
+            config.set("resources", resource_class, str(limit))
+        self._cap_solver_threads()
+
+        luigi.interface.InterfaceLogging.setup(type('opts',
+                                                    (),
+                                                    {'background': None,
+                                                     'logdir': None,
+                                                     'logging_conf_file': None,
+                                                     'log_level': 'DEBUG' if self.verbose else 'WARNING'
+                                                     }))
+        if self.central_scheduler:
+            # Wait for tasks that another runner process is executing instead
+            # of giving up on them.
+            luigi.configuration.get_config().set("worker", "keep_alive", "true")
+            luigi.build(
+                pipelines,
+                local_scheduler=False,
+                scheduler_host=self.scheduler_host,
+                scheduler_port=self.scheduler_port,
+                workers=self.workers,
+            )
+        else:
+            luigi.build(pipelines, local_scheduler=True, workers=self.workers)
+
+        self._record_pipelines(instance_name, pipelines)
+
+    def _cap_solver_threads(self) -> None:
+        """Give each Gurobi model at most its worker's share of the cores.
+
+        Gurobi uses all cores per model by default, which oversubscribes the
+        host while the other Luigi workers and instance workers run heuristic
+        pipelines next to an ``exclusive_solver`` task.
+        """
+        path = Path.cwd() / GUROBI_ENV_FILE
+        existing = path.read_text() if path.exists() else None
+        if existing is not None and not existing.startswith(_GUROBI_ENV_HEADER):
+            print(f"Keeping {path}; it should set Threads when workers run beside Gurobi")
+            return
+
+        n_workers = self.workers * self.instance_workers
+        if n_workers <= 1:
+            # A single worker may give the solver all cores again.
+            if existing is not None:
+                os.remove(path)
+            return
+
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+        content = f"{_GUROBI_ENV_HEADER}Threads {threads}\n"
+        if existing == content:
+            return
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "w") as f:
+            f.write(content)
+        os.replace(tmp, path)
+
+    def _record_pipelines(self, instance_name: str, pipelines: list[luigi.Task]) -> None:
+        """Add finished pipelines to the campaign manifest.
+
+        A terminal record (timeout, oom, dominated) of any task of a pipeline
+        ends the pipeline; it is written once per pipeline so that ranking
+        lists every pipeline that depended on the task. Pipelines that failed
+        without a terminal record are left out, so a resumed run retries them.
+        A pipeline that succeeds on a rerun, e.g. with higher limits, loses
+        the terminal records of its earlier attempt.
+        """
+        records = []
+        for pipeline in pipelines:
+            finished = self.manifest.finished_pipelines(instance_name).get(pipeline._base_task_id)
+
+            summary = pipeline.output()["summary"]
+            if summary.exists():
+                self._discard_pipeline_record(pipeline)
+                for task in dag_tasks(pipeline):
+                    clear_limit_record(task)
+                if finished is None or finished["status"] != "ok":
+                    records.append({
+                        "pipeline": pipeline._base_task_id,
+                        "status": "ok",
+                        "path": summary.path,
+                    })
+                continue
+
+            if finished is not None:
+                continue
+
+            terminal = self._terminal_record(pipeline)
+            if terminal is None:
+                self._discard_pipeline_record(pipeline)
+                continue
+
+            status, path = terminal
+            records.append({
+                "pipeline": pipeline._base_task_id,
+                "status": status,
+                "path": self._write_pipeline_record(pipeline, load_json(path)),
+            })
+        self.manifest.record_pipelines(instance_name, records)
+
+    @staticmethod
+    def _write_pipeline_record(pipeline: luigi.Task, task_record: dict) -> str:
+        """Write the terminal record of a task as the record of ``pipeline``."""
+        algos = {f"{stage}_algo": algo for stage, algo in stage_algos(pipeline).items()}
+        record = {
+            **task_record,
+            **algos,
+            "pipeline_id": pipeline_id(algos),
+            "pipeline_task_id": pipeline._base_task_id,
+        }
+        path = pipeline_record_path(pipeline)
+        dump_json(path, record)
+        record_result(pipeline, record, status=record["status"])
+        return path
+
+    @staticmethod
+    def _discard_pipeline_record(pipeline: luigi.Task) -> None:
+        """Drop the terminal record of an earlier attempt of ``pipeline``."""
+        path = pipeline_record_path(pipeline)
+        if os.path.exists(path):
+            os.remove(path)
+            discard_result(pipeline)
+
+    @staticmethod
+    def _terminal_record(pipeline: luigi.Task) -> tuple[str, str] | None:
+        stack, seen = [pipeline], set()
+        while stack:
+            task = stack.pop()
+            if id(task) in seen:
+                continue
+            seen.add(id(task))
+            stack.extend(flatten(task.requires()))
+
+            for status, path in (
+                    ("limit", limit_record_path(task)),
+                    ("dominated", dominated_record_path(task)),
+            ):
+                if os.path.exists(path):
+                    if status == "limit":
+                        status = load_json(path).get("status", status)
+                    return status, path
+        return None
+
+    def _run_pipeline_stream(
+            self,
+            instance_name: str,
+            pipeline_stream: Iterator[luigi.Task],
+    ) -> tuple[list[luigi.Task], float]:
+        """Execute pipelines chunk by chunk while they are enumerated.
+
+        Upstream tasks shared with earlier chunks are already complete when
+        a later chunk is scheduled, so Luigi only runs the new tasks. Returns
+        the executed pipelines and the time spent enumerating them.
+        """
+        pipelines = []
+        t_enumerate = 0.0
+        while True:
+            t0 = time.perf_counter()
+            chunk = list(islice(pipeline_stream, self.stream_chunk_size))
+            t_enumerate += time.perf_counter() - t0
+            if not chunk:
+                break
+
+            print(
+                f"\nRunning pipelines {len(pipelines) + 1}-{len(pipelines) + len(chunk)} "
+                f"with {self.workers} worker(s)...\n"
+            )
+            self._execute_pipelines(instance_name, chunk)
+            pipelines.extend(chunk)
+
+        return pipelines, t_enumerate
+
+    def _racing_enabled(self) -> bool:
+        """Racing needs a monotone partial objective, i.e. total distance."""
+        if not self.racing:
+            return False
+
+        if isinstance(self.data_card, dict):
+            objective = self.data_card.get("objective")
+        else:
+            objective = getattr(self.data_card, "objective", None)
+
+        if objective != "distance":
+            print(f"Racing mode is only supported for the distance objective, not {objective!r}")
+            return False
+        return True
+
+    @staticmethod
+    def _summary_files(output_folder: Path) -> list[dict]:
+        return [load_json(path) for path in summary_paths(output_folder)]
+
+    def _seed_incumbent(self, output_folder: Path) -> None:
+        """Start the incumbent from pipelines finished in an earlier run."""
+        distances = [
+            summary["tours_summary"]["total_distance"]
+            for summary in self._summary_files(output_folder)
+            if "tours_summary" in summary
+        ]
+        reset_incumbent(str(output_folder), min(distances, default=math.inf))
+
+    def _learn_component_costs(self, output_folder: Path) -> None:
+        """Update the running mean stage time of every task class."""
+        for summary in self._summary_files(output_folder):
+            for entry in summary.get("provenance", []):
+                mean, count = self._component_costs.get(entry["task_class"], (0.0, 0))
+                count += 1
+                mean += (float(entry["time"]) - mean) / count
+                self._component_costs[entry["task_class"]] = (mean, count)
+
+    def _predicted_cost(self, pipeline: luigi.Task) -> float:
+        cost = 0.0
+        stack, seen = [pipeline], set()
+        while stack:
+            task = stack.pop()
+            if id(task) in seen:
+                continue
+            seen.add(id(task))
+            stack.extend(flatten(task.requires()))
+
+            name = type(task).__name__
+            if name in self._component_costs:
+                cost += self._component_costs[name][0]
+            elif getattr(task, "resource_class", None) == "exclusive_solver":
+                # Unseen exact solvers go last so an incumbent exists first.
+                cost = math.inf
+        return cost
+
+    def _order_by_predicted_cost(self, pipelines: list[luigi.Task]) -> list[luigi.Task]:
+        """Sort pipelines cheapest first and let Luigi schedule them in that order."""
+        ordered = sorted(pipelines, key=self._predicted_cost)
+        for rank, pipeline in enumerate(ordered):
+            pipeline.priority = len(ordered) - rank
+        return ordered
+
+    def _card_key(self) -> str:
+        """Hash of the data card content and the excluded algorithms."""
+        if isinstance(self.data_card, dict):
+            data_card = self.data_card
+        else:
+            data_card = getattr(self.data_card, "__dict__", str(self.data_card))
+
+        payload = {
+            "data_card": data_card,
+            "excluded": sorted(self.excluded),
+            "max_pipelines": self.max_pipelines,
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _synthesis_key(card_key: str) -> str:
+        """Extend a card key by the current CLS-Luigi repository contents."""
+        payload = {
+            "card": card_key,
+            "repository": sorted(
+                f"{combinator!r}: {tpe!r}"
+                for combinator, tpe in RepoMeta.repository.items()
+            ),
+        }
+        raw = json.dumps(payload, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @contextmanager
+    def _scoped_repository(self, final_algos) -> Iterator[None]:
+        """Hide components that are not applicable to this instance set.
+
+        CLS-Luigi registers every imported component in the process-wide
+        ``RepoMeta.repository``, and a warm worker may serve several
+        instance sets. Components imported for another set are removed
+        from the repository while this set is synthesized and executed,
+        and put back afterwards.
+        """
+        known = {card.algo_name for card in self.algos}
+        allowed = {card.algo_name for card in final_algos}
+        repository = RepoMeta.repository
+        hidden = {}
+        for combinator in list(repository):
+            cls = getattr(combinator, "cls", None) or getattr(combinator, "tpe", None)
+            name = getattr(cls, "__name__", None)
+            if name in known and name not in allowed:
+                hidden[combinator] = repository.pop(combinator)
+        try:
+            yield
+        finally:
+            repository.update(hidden)
 
     def _import_models(self, algos_applicable):
         """Import applicable concrete CLS-Luigi components."""
@@ -239,8 +922,13 @@ class PipelineRunner(ABC):
                         f"{card.algo_name}: {exc}"
                     )
 
-    def _build_pipelines(self):
-        """Build valid pipelines using inhabitation"""
+    def iter_pipelines(self) -> Iterator[luigi.Task]:
+        """Enumerate valid pipelines lazily.
+
+        Each inhabitant is instantiated exactly once and validated right
+        away, so only the candidate under inspection is held in memory and
+        callers can start executing before the enumeration is exhausted.
+        """
         from ware_ops_pipes.pipelines.templates.template_1 import (
             LayoutLoader, InstanceLoader, AbstractItemAssignment, AbstractBatching,
             MultiOrderBatching, AbstractPickerRouting,
@@ -248,8 +936,6 @@ class PipelineRunner(ABC):
         )
 
         endpoint = AbstractResultAggregation
-        repository = RepoMeta.repository
-        fcl = FiniteCombinatoryLogic(repository, Subtypes(RepoMeta.subtypes))
         inhabitation_result, inhabitation_size = inhabit(endpoint)
 
         max_results = self.max_pipelines if inhabitation_size == 0 else inhabitation_size
@@ -266,10 +952,14 @@ class PipelineRunner(ABC):
         ])
 
         print(f"Enumerating up to {max_results} pipelines...")
-        pipelines = [
-            t() for t in inhabitation_result.evaluated[0:max_results]
-            if validator.validate(t())
-        ]
+        for tree in islice(inhabitation_result.evaluated, max_results):
+            pipeline = tree()
+            if validator.validate(pipeline):
+                yield pipeline
+
+    def _build_pipelines(self):
+        """Build valid pipelines using inhabitation"""
+        pipelines = list(self.iter_pipelines())
 
         if self.verbose and pipelines:
             print(f"Found {len(pipelines)} valid pipelines")
@@ -278,14 +968,48 @@ class PipelineRunner(ABC):
                 print(print_tree(pipeline))
         return pipelines
 
+    def _compact(
+            self,
+            output_folder: Path,
+            pipelines: list[luigi.Task],
+            ranking: pd.DataFrame | None,
+    ) -> None:
+        keep = []
+        if self.retention == "keep-best-k":
+            if ranking is None or ranking.empty:
+                # Without a ranking the best pipelines are unknown.
+                return
+            keep = best_pipelines(pipelines, ranking, self.retention_k)
+        n_files, n_bytes = compact_instance(
+            output_folder, pipelines, keep, archive=self.archive_intermediates
+        )
+        if n_files:
+            action = "Archived" if self.archive_intermediates else "Removed"
+            print(f"{action} {n_files} intermediate files ({n_bytes / 2**20:.1f} MiB)")
+
+    def _evict_data_cache(self) -> None:
+        n_entries, n_bytes = evict_data_cache(
+            str(self.project_root / "experiments" / "output" / "_data_cache"),
+            self.data_cache_max_mb * 2**20,
+        )
+        if n_entries:
+            print(f"Evicted {n_entries} data cache entries ({n_bytes / 2**20:.1f} MiB)")
+
     def create_ranking(self, instance_name: str, output_folder: Path):
-        """Create ranking for this instance"""
+        """Create ranking for this instance and return it"""
         try:
+            store_kwargs = {}
+            if self.results_db is not None:
+                store_kwargs = {
+                    "instance_set": self.instance_set_name,
+                    "results_store": get_results_store(self.results_db),
+                }
             ranker = self.ranker(
                 output_dir=str(output_folder),
                 instance_name=instance_name,
                 taxonomy=TAXONOMY,
-                data_card=self.data_card
+                data_card=self.data_card,
+                **store_kwargs,
             )
             df = ranker.evaluate()
 
@@ -293,16 +1017,28 @@ class PipelineRunner(ABC):
             if not df.empty:
                 best = df.iloc[0]
                 print(f"Best: {best['pipeline_id']} = {best['value']:.2f}")
-                return best
+            return df
 
         except Exception as e:
             print(f"Ranking error: {e}")
 
     def save_runtimes(self):
+        """Merge this runner's timings into the instance set runtime file.
+
+        Shards and resumed runs write to the same file, so existing entries
+        are kept and the read-modify-write is serialized with a file lock.
+        """
         output_folder = (
                 self.project_root / "experiments" / "output"
                 / "runtimes"
         )
         output_folder.mkdir(parents=True, exist_ok=True)
-        with open(output_folder / f"{self.instance_set_name}.json", "w") as f:
-            json.dump(self.pipeline_runtimes, f, indent=2)
+        path = output_folder / f"{self.instance_set_name}.json"
+
+        with file_lock(f"{path}.lock"):
+            runtimes = load_json(str(path)) if path.exists() else {}
+            runtimes.update(self.pipeline_runtimes)
+
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            dump_json(tmp_path, runtimes, indent=2)
+            os.replace(tmp_path, path)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import traceback
+from collections import Counter, OrderedDict, deque
+from pathlib import Path
+from typing import Iterator
+
+from ware_ops_pipes.pipelines.layout_cache import set_layout_cache_size
+
+
+def _warm_worker_main(task_queue, result_queue, layout_cache_size: int) -> None:
+    """Serve instances until a ``None`` job arrives.
+
+    Runners are sent once per worker and kept, so the worker also keeps its
+    synthesis cache and its resident layouts from one instance to the next.
+    """
+    set_layout_cache_size(layout_cache_size)
+    runners = {}
+
+    while True:
+        job = task_queue.get()
+        if job is None:
+            break
+
+        runner_id, runner, instance_name, file_paths = job
+        if runner is not None:
+            runners[runner_id] = runner
+
+        try:
+            timings = runners[runner_id]._run_instance_safe(instance_name, file_paths)
+        except Exception:
+            traceback.print_exc()
+            timings = None
+        result_queue.put((runner_id, instance_name, timings))
+
+
+class WarmWorkerPool:
+    """Long-lived instance workers that keep layouts resident.
+
+    Every worker holds an LRU of deserialized layouts (see
+    ``ware_ops_pipes.pipelines.layout_cache``). Jobs are handed out one at a
+    time; an idle worker is given an instance whose layout it already holds,
+    then one whose layout no worker holds, and only then spills over to the
+    layout with the largest backlog. Instances of one layout therefore stay
+    on few workers without leaving other workers idle.
+
+    The pool may serve several runners, e.g. the instance sets of a
+    campaign. Each runner is pickled to a worker only with its first job.
+
+    A worker that dies (e.g. killed for running out of memory) is replaced
+    by a fresh one; the instance it was running is reported as failed.
+    """
+
+    # Seconds to wait for a result before checking that the workers are alive.
+    poll_interval = 1.0
+
+    def __init__(self, n_workers: int, layout_cache_size: int = 4):
+        self.n_workers = max(1, n_workers)
+        self.layout_cache_size = layout_cache_size
+
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self._result_queue = None
+        self._task_queues = []
+        self._processes = []
+
+        # Parent-side mirror of the layouts each worker holds.
+        self._resident: list[OrderedDict[str, None]] = []
+        self._runners_sent: list[set[int]] = []
+        self._owner: dict[tuple[int, str], int] = {}
+
+    def __enter__(self) -> WarmWorkerPool:
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self._processes:
+            return
+
+        self._result_queue = self._ctx.Queue()
+        for i in range(self.n_workers):
+            task_queue, process = self._spawn(i)
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+            self._resident.append(OrderedDict())
+            self._runners_sent.append(set())
+
+    def _spawn(self, worker: int):
+        task_queue = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_warm_worker_main,
+            args=(task_queue, self._result_queue, self.layout_cache_size),
+            name=f"warm-worker-{worker}",
+        )
+        process.start()
+        return task_queue, process
+
+    def close(self) -> None:
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join()
+        self._task_queues.clear()
+        self._processes.clear()
+        self._resident.clear()
+        self._runners_sent.clear()
+
+    def run(
+            self,
+            jobs: list[tuple[object, str, list[Path], str | None]],
+    ) -> Iterator[tuple[object, str, dict | None]]:
+        """Run ``(runner, instance_name, file_paths, layout_key)`` jobs.
+
+        Yields ``(runner, instance_name, timings)`` in completion order. Jobs
+        without a layout key are scheduled without affinity. At most
+        ``runner.instance_workers`` instances of one runner run at a time.
+        """
+        self.start()
+        runners = {id(job[0]): job[0] for job in jobs}
+
+        pending: OrderedDict[str | None, deque] = OrderedDict()
+        for runner, instance_name, file_paths, key in jobs:
+            pending.setdefault(key, deque()).append((id(runner), instance_name, file_paths))
+
+        idle = deque(range(self.n_workers))
+        running = Counter()
+        while pending or sum(running.values()):
+            while idle:
+                job = self._next_job(idle[0], pending, running, runners)
+                if job is None:
+                    break
+                runner_id = self._dispatch(idle.popleft(), *job, pending, runners)
+                running[runner_id] += 1
+
+            try:
+                runner_id, instance_name, timings = self._result_queue.get(
+                    timeout=self.poll_interval
+                )
+            except queue.Empty:
+                for worker, runner_id, instance_name in self._replace_dead_workers():
+                    if runner_id is None:
+                        continue
+                    running[runner_id] -= 1
+                    idle.append(worker)
+                    yield runners[runner_id], instance_name, None
+                continue
+
+            running[runner_id] -= 1
+            idle.append(self._owner.pop((runner_id, instance_name)))
+            yield runners[runner_id], instance_name, timings
+
+    def _replace_dead_workers(self) -> list[tuple[int, int | None, str | None]]:
+        """Respawn dead workers and return ``(worker, runner_id, instance_name)``.
+
+        ``runner_id`` and ``instance_name`` identify the instance the worker
+        was running, or are None if it was idle.
+        """
+        replaced = []
+        for worker, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+
+            lost = next(
+                (job for job, owner in self._owner.items() if owner == worker),
+                (None, None),
+            )
+            if lost[0] is not None:
+                del self._owner[lost]
+            print(
+                f"Warning: {process.name} exited with code {process.exitcode}"
+                + (f" while running {lost[1]}" if lost[1] is not None else "")
+            )
+
+            process.join()
+            self._task_queues[worker], self._processes[worker] = self._spawn(worker)
+            self._resident[worker].clear()
+            self._runners_sent[worker].clear()
+            replaced.append((worker, *lost))
+        return replaced
+
+    def _next_job(
+            self,
+            worker: int,
+            pending: OrderedDict,
+            running: Counter,
+            runners: dict,
+    ) -> tuple[str | None, int] | None:
+        """Key and queue position of the next job for ``worker``, or None."""
+        held = set().union(*self._resident)
+        candidates = [key for key in reversed(self._resident[worker]) if key in pending]
+        candidates += [key for key in pending if key not in held]
+        candidates += sorted(pending, key=lambda k: len(pending[k]), reverse=True)
+
+        for key in candidates:
+            for position, (runner_id, _, _) in enumerate(pending[key]):
+                if running[runner_id] < getattr(runners[runner_id], "instance_workers", self.n_workers):
+                    return key, position
+        return None
+
+    def _dispatch(
+            self,
+            worker: int,
+            key: str | None,
+            position: int,
+            pending: OrderedDict,
+            runners: dict,
+    ) -> int:
+        queue = pending[key]
+        runner_id, instance_name, file_paths = queue[position]
+        del queue[position]
+        if not queue:
+            del pending[key]
+
+        runner = None
+        if runner_id not in self._runners_sent[worker]:
+            runner = runners[runner_id]
+            self._runners_sent[worker].add(runner_id)
+
+        if key is not None:
+            resident = self._resident[worker]
+            resident[key] = None
+            resident.move_to_end(key)
+            while len(resident) > self.layout_cache_size:
+                resident.popitem(last=False)
+
+        self._owner[(runner_id, instance_name)] = worker
+        self._task_queues[worker].put((runner_id, runner, instance_name, file_paths))
+        return runner_id
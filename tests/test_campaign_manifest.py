@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("ware_ops_algos")
+
+from ware_ops_pipes.synthesis.campaign_manifest import CampaignManifest  # noqa: E402
+
+
+def test_instances_are_complete_for_their_portfolio_only(tmp_path):
+    path = tmp_path / "set.jsonl"
+    CampaignManifest(path).record_instance_complete("i1", 3, "portfolio-a")
+
+    manifest = CampaignManifest(path)
+    assert manifest.is_complete("i1", "portfolio-a")
+    assert not manifest.is_complete("i1", "portfolio-b")
+    assert not manifest.is_complete("i2", "portfolio-a")
+
+    manifest.record_instance_complete("i1", 5, "portfolio-b")
+    assert CampaignManifest(path).is_complete("i1", "portfolio-b")
+
+
+def test_markers_without_synthesis_key_do_not_skip(tmp_path):
+    path = tmp_path / "set.jsonl"
+    path.write_text('{"instance": "i1", "complete": true, "n_pipelines": 3}\n')
+
+    assert not CampaignManifest(path).is_complete("i1", "portfolio-a")
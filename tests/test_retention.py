@@ -0,0 +1,51 @@
+import tarfile
+
+import pytest
+
+pytest.importorskip("ware_ops_algos")
+
+from ware_ops_pipes.synthesis.retention import archive_files  # noqa: E402
+
+
+def _members(archive):
+    with tarfile.open(archive) as tar:
+        return {
+            member.name: tar.extractfile(member).read()
+            for member in tar.getmembers()
+        }, len(tar.getmembers())
+
+
+def test_rerun_replaces_archived_members(tmp_path):
+    archive = tmp_path / "intermediates.tar"
+    (tmp_path / "routing").mkdir()
+    first = tmp_path / "routing" / "a.pkl"
+    second = tmp_path / "b.pkl"
+
+    first.write_bytes(b"first run")
+    second.write_bytes(b"kept")
+    archive_files(archive, tmp_path, [str(first), str(second)])
+
+    first.write_bytes(b"rerun")
+    archive_files(archive, tmp_path, [str(first)])
+
+    members, n_members = _members(archive)
+    assert members == {"routing/a.pkl": b"rerun", "b.pkl": b"kept"}
+    assert n_members == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["b.pkl", "intermediates.tar", "routing"]
+
+
+def test_duplicates_of_appended_archives_are_collapsed(tmp_path):
+    archive = tmp_path / "intermediates.tar"
+    path = tmp_path / "a.pkl"
+    for content in (b"old", b"new"):
+        path.write_bytes(content)
+        with tarfile.open(archive, "a") as tar:
+            tar.add(path, arcname="a.pkl")
+
+    other = tmp_path / "c.pkl"
+    other.write_bytes(b"other")
+    archive_files(archive, tmp_path, [str(other)])
+
+    members, n_members = _members(archive)
+    assert members == {"a.pkl": b"new", "c.pkl": b"other"}
+    assert n_members == 2
@@ -0,0 +1,175 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("ware_ops_algos")
+
+from ware_ops_pipes.data_loaders import FoodmartLoader, HesslerIrnichLoader, IBRSPLoader  # noqa: E402
+from ware_ops_pipes.data_loaders.sections import vertex_table, vertices_as_coords  # noqa: E402
+
+DEPARTING, ARRIVAL = 0, 1
+
+ARCS = "0 2 1.5\n2 3 2\n3 4 1.25\n1 4 2.5\n"
+PATHS = "0 2 1.5\n0 3 3.5\n2 4 3\n3 1 3.75\n"
+VERTICES = (
+    '0 0 0 "depot"\n'
+    '1 0 0 "depot"\n'
+    '2 1 1 "product"\n'
+    '3 3 2 "product"\n'
+    '4 2.5 3 "intersection"\n'
+)
+# A short and an overlong arc row, which the table parser cannot decode.
+RAGGED_ARCS = ARCS + "5 6\n5 6 7 8\n"
+# A vertex of unknown type, a short row and a valid row after them.
+RAGGED_VERTICES = VERTICES + '5 4 4 "unknown"\n6 4\n7 5 5 "product"\n'
+
+# Output of the line-by-line FoodmartLoader._parse and IBRSPLoader._parse
+# the bulk section parsers replaced, on the fixtures above.
+EXPECTED_ARCS = [(0, 2, 1.5), (2, 3, 2.0), (3, 4, 1.25), (1, 4, 2.5)]
+EXPECTED_RAGGED_ARCS = EXPECTED_ARCS + [(5, 6, 7.0)]
+EXPECTED_PATHS = {(0, 2): 1.5, (0, 3): 3.5, (2, 4): 3.0, (3, 1): 3.75}
+EXPECTED_VERTICES = {
+    0: (0.0, 0.0, "start_node"),
+    1: (1.0, 0.0, "end_node"),
+    2: (1.0, 1.0, "pick_node"),
+    3: (3.0, 2.0, "pick_node"),
+    4: (2.5, 3.0, "intersection"),
+}
+EXPECTED_RAGGED_VERTICES = {**EXPECTED_VERTICES, 7: (5.0, 5.0, "pick_node")}
+# IBRSP snaps intersections to the nearest aisle of a pick node.
+EXPECTED_IBRSP_VERTICES = {**EXPECTED_VERTICES, 4: (3.0, 3.0, "intersection")}
+
+
+def test_arrival_depot_is_shifted():
+    coords = vertices_as_coords(*vertex_table(VERTICES, DEPARTING, ARRIVAL))
+
+    assert coords[0] == (0.0, 0.0, "start_node")
+    assert coords[1] == (1.0, 0.0, "end_node")
+    assert coords[4] == (2.5, 3.0, "intersection")
+
+
+def _graph(vertex_prefix, arcs=ARCS, vertices=VERTICES):
+    return (
+        "//Graph\n//NbVerticesIntersections\n1\n"
+        f"//DepartingDepot\n{DEPARTING}\n//ArrivalDepot\n{ARRIVAL}\n"
+        f"//Arcs\n//Start End Distance\n{arcs}"
+        f"//LocStart LocEnd ShortestPath\n{PATHS}"
+        f"{vertex_prefix}\n//Idx X Y Type\n{vertices}"
+    )
+
+
+FOODMART = (
+    "//NbLocations\n5\n//NbProducts\n2\n//K: NbBoxesTrolley\n2 boxes\n"
+    "//NbDimensionsCapacity\n1 dim\n//B: CapaBox\n10 units\n//A box can accept mixed orders\n1 yes\n"
+    "//Products\n//Idx Location Volume\n1 2 1.5\n2 3 2\n"
+    "//Orders\n//NbOrders\n2\n7 0 2 1 3 2 4\n8 0 1 2 1\n"
+)
+
+IBRSP = (
+    "//NbLocations\n5\n//NbProducts\n2\n//NbPickers\n2 pickers\n//CapaPicker\n10 units\n"
+    "//TimeToTravelOneDistanceUnit\n1 s\n//SetupTime\n5 s\n//PickTime\n2 s\n"
+    "//Products\n//Idx Location Volume\n1 2 1.5\n2 3 2\n"
+    "//Orders\n//NbOrders\n2\n7 55 0 2 1 3 2 4\n8 66 0 1 2 1\n"
+)
+
+
+def _variants(text):
+    return {
+        "lf": text,
+        "crlf": text.replace("\n", "\r\n"),
+        "blank lines": text.replace("\n", "\n\n  "),
+    }
+
+
+def _write(tmp_path, name, text):
+    (tmp_path / name).write_bytes(text.encode("utf-8"))
+    return name
+
+
+@pytest.mark.parametrize("variant", ["lf", "crlf", "blank lines"])
+@pytest.mark.parametrize("arcs, vertices, expected_arcs, expected_vertices", [
+    (ARCS, VERTICES, EXPECTED_ARCS, EXPECTED_VERTICES),
+    (RAGGED_ARCS, VERTICES, EXPECTED_RAGGED_ARCS, EXPECTED_VERTICES),
+    ("", VERTICES, [], EXPECTED_VERTICES),
+    (ARCS, RAGGED_VERTICES, EXPECTED_ARCS, EXPECTED_RAGGED_VERTICES),
+], ids=["plain", "ragged arcs", "no arcs", "ragged vertices"])
+def test_foodmart_graph_sections(tmp_path, variant, arcs, vertices, expected_arcs, expected_vertices):
+    text = _variants(FOODMART + _graph("//Vertices", arcs, vertices))[variant]
+    parsed = FoodmartLoader(tmp_path).parse_instance(_write(tmp_path, "f.txt", text))
+
+    assert parsed["header"]["NbOrders"] == 2
+    assert parsed["header"]["DepartingDepot"] == DEPARTING
+    assert parsed["arcs"] == expected_arcs
+    assert parsed["shortest_paths"] == EXPECTED_PATHS
+    assert parsed["vertices_coords"] == expected_vertices
+    assert [article.article_id for article in parsed["articles"]] == [1, 2]
+    assert [(loc.x, loc.y) for loc in parsed["locations"]] == [(1.0, 1.0), (3.0, 2.0)]
+    assert len(parsed["orders"]) == 2
+
+
+@pytest.mark.parametrize("variant", ["lf", "crlf", "blank lines"])
+@pytest.mark.parametrize("arcs, vertices, expected_arcs", [
+    (ARCS, VERTICES, EXPECTED_ARCS),
+    (RAGGED_ARCS, VERTICES + "6 4\n", EXPECTED_RAGGED_ARCS),
+], ids=["plain", "ragged"])
+def test_ibrsp_graph_sections(tmp_path, variant, arcs, vertices, expected_arcs):
+    text = _variants(IBRSP + _graph("//Location", arcs, vertices))[variant]
+    parsed = IBRSPLoader(tmp_path).parse_instance(_write(tmp_path, "i.txt", text))
+
+    assert parsed["header"]["NbPickers"] == 2
+    assert parsed["arcs"] == expected_arcs
+    assert parsed["shortest_paths"] == EXPECTED_PATHS
+    assert parsed["vertices_coords"] == EXPECTED_IBRSP_VERTICES
+
+
+HESSLER_IRNICH = (
+    "NUM_AISLES: 3\nNUM_CELLS: 10\nDEPOT_AISLE: 0\nDEPOT_LOCATION: 0\n"
+    "DISTANCE_AISLE_TO_AISLE: 5\nDISTANCE_CELL_TO_CELL: 1\nDISTANCE_TOP_TO_CELL: 1\n"
+    "DISTANCE_BOTTOM_TO_CELL: 1\nDISTANCE_TOP_OR_BOTTOM_TO_DEPOT: 2\n"
+    "ARTICLE_SECTION\nID 1\nID 2 W 5\n"
+    "SKU_SECTION\nID 1 A 1 C 2 Q 3 left\nID 2 A 2 C 4 Q 1 right\n"
+    "ORDER_SECTION\nNUM_ARTICLES_IN_ORDER 2\nID 1 X 2\nID 2 X 1\n"
+    "NUM_ARTICLES_IN_ORDER 1\nID 2 X 5\n"
+)
+
+
+@pytest.mark.parametrize("variant", ["lf", "crlf", "blank lines"])
+def test_hessler_irnich_sections(tmp_path, variant):
+    text = _variants(HESSLER_IRNICH)[variant]
+    parsed = HesslerIrnichLoader(tmp_path).parse_instance(_write(tmp_path, "h.txt", text))
+
+    assert parsed["header"]["NUM_CELLS"] == "10"
+    assert parsed["header"]["DISTANCE_TOP_OR_BOTTOM_TO_DEPOT"] == "2"
+    assert parsed["articles"] == [{"article_id": 1}, {"article_id": 2, "weight": 5}]
+    assert parsed["skus"] == [
+        {"article_id": 1, "aisle": 1, "cell": 8, "quantity": 3, "side": "left"},
+        {"article_id": 2, "aisle": 2, "cell": 6, "quantity": 1, "side": "right"},
+    ]
+    assert parsed["orders"] == [
+        [{"article_id": 1, "amount": 2}, {"article_id": 2, "amount": 1}],
+        [{"article_id": 2, "amount": 5}],
+    ]
+
+
+def test_hessler_irnich_missing_weights_are_masked(tmp_path):
+    text = HESSLER_IRNICH.replace("ID 2 W 5", "ID 2 W 0")
+    loader = HesslerIrnichLoader(tmp_path)
+    tokens = loader.tokenize_instance(_write(tmp_path, "h.txt", text))
+
+    assert tokens["article_has_weight"].tolist() == [False, True]
+    assert loader.assemble_instance(tokens)["articles"] == [
+        {"article_id": 1}, {"article_id": 2, "weight": 0},
+    ]
+
+
+def test_cached_tokens_round_trip(tmp_path):
+    name = _write(tmp_path, "f.txt", FOODMART + _graph("//Vertices"))
+    loader = FoodmartLoader(tmp_path)
+    tokens = loader.tokenize_instance(name)
+
+    cache_dir = tmp_path / "cache"
+    loader._cached_tokens(name, cache_dir)
+    cached = loader._cached_tokens(name, cache_dir)
+
+    assert sorted(cached) == sorted(tokens)
+    for key, value in tokens.items():
+        np.testing.assert_array_equal(cached[key], value)
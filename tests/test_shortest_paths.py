@@ -0,0 +1,63 @@
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.sparse.csgraph import floyd_warshall
+
+pytest.importorskip("ware_ops_algos")
+
+from ware_ops_pipes.data_loaders.shortest_paths import (  # noqa: E402
+    predecessor_matrix,
+    shortest_path_matrices,
+)
+
+
+@pytest.fixture
+def grid():
+    # Unit grids have many shortest paths of equal length between two nodes.
+    graph = nx.grid_2d_graph(6, 8)
+    nx.set_edge_attributes(graph, 1.0, "weight")
+    return graph, list(graph.nodes())
+
+
+def _path(predecessors, nodes, source, target):
+    i, j = nodes.index(source), nodes.index(target)
+    path = [j]
+    while path[-1] != i:
+        path.append(predecessors[i, path[-1]])
+    return [nodes[k] for k in reversed(path)]
+
+
+def test_distances_match_floyd_warshall(grid):
+    graph, nodes = grid
+    distances, _ = shortest_path_matrices(graph, nodes)
+
+    adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight="weight", dtype=float)
+    np.testing.assert_array_equal(distances, floyd_warshall(adjacency, directed=False))
+
+
+def test_predecessors_expand_to_shortest_paths(grid):
+    graph, nodes = grid
+    distances, predecessors = shortest_path_matrices(graph, nodes, with_predecessors=True)
+
+    for source in nodes[::5]:
+        for target in nodes:
+            path = _path(predecessors, nodes, source, target)
+            assert path[0] == source and path[-1] == target
+            assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+            assert len(path) - 1 == distances[nodes.index(source), nodes.index(target)]
+
+
+def test_predecessors_are_pinned(grid):
+    # Ties are broken by scipy's Dijkstra, not as by the former Floyd-Warshall;
+    # expanded tours must not change silently.
+    graph, nodes = grid
+    predecessors = predecessor_matrix(graph, nodes)
+
+    assert _path(predecessors, nodes, (0, 0), (5, 7)) == [
+        (0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0),
+        (5, 1), (5, 2), (5, 3), (5, 4), (5, 5), (5, 6), (5, 7),
+    ]
+    assert _path(predecessors, nodes, (2, 5), (4, 1)) == [
+        (2, 5), (3, 5), (4, 5), (4, 4), (4, 3), (4, 2), (4, 1),
+    ]
+    np.testing.assert_array_equal(predecessors, predecessor_matrix(graph, nodes))